@@ -0,0 +1,32 @@
+"""Store the pending TOTP QR code on accounts
+
+/2fa/enable renders a QR code for the pending TOTP secret. Keeping the
+rendered PNG next to the secret lets repeated calls return it without
+generating a new secret and re-rendering the image.
+
+Revision ID: 0e4549accb74
+Revises: cd9ec0946b40
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0e4549accb74'
+down_revision: Union[str, Sequence[str], None] = 'cd9ec0946b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add accounts.totp_qr_code."""
+    op.add_column('accounts', sa.Column('totp_qr_code', sa.Text(), nullable=True), if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Drop accounts.totp_qr_code."""
+    op.drop_column('accounts', 'totp_qr_code', if_exists=True)
@@ -21,22 +21,33 @@ def upgrade() -> None:
     """Upgrade schema."""
     # Create enum type for account role with explicit values
     # Using native postgres ENUM to ensure values match exactly what the model expects
-    op.execute("CREATE TYPE accountrole AS ENUM ('admin', 'editor', 'chat_user')")
-
-    # Add role column to accounts table with default 'chat_user'
-    op.add_column('accounts', sa.Column('role', sa.Enum('admin', 'editor', 'chat_user', name='accountrole', create_type=False), nullable=False, server_default='chat_user'))
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            CREATE TYPE accountrole AS ENUM ('admin', 'editor', 'chat_user');
+        EXCEPTION
+            WHEN duplicate_object THEN NULL;
+        END $$;
+        """
+    )
+
+    # Add role column to accounts table with default 'chat_user'.
+    # The default is a constant literal, so Postgres 11+ stores it in the catalog
+    # and skips rewriting the accounts heap (metadata-only, no backfill needed).
+    op.execute("ALTER TABLE accounts ADD COLUMN IF NOT EXISTS role accountrole NOT NULL DEFAULT 'chat_user'")
 
     # Drop can_edit_flow column from chat_window_access table
-    op.drop_column('chat_window_access', 'can_edit_flow')
+    op.drop_column('chat_window_access', 'can_edit_flow', if_exists=True)
 
 
 def downgrade() -> None:
     """Downgrade schema."""
     # Add can_edit_flow back to chat_window_access
-    op.add_column('chat_window_access', sa.Column('can_edit_flow', sa.Boolean(), nullable=False, server_default='false'))
+    op.add_column('chat_window_access', sa.Column('can_edit_flow', sa.Boolean(), nullable=False, server_default='false'), if_not_exists=True)
 
     # Drop role column from accounts
-    op.drop_column('accounts', 'role')
+    op.drop_column('accounts', 'role', if_exists=True)
 
     # Drop enum type
     op.execute("DROP TYPE IF EXISTS accountrole")
@@ -0,0 +1,53 @@
+"""Partial index for active embed tokens
+
+Token verification (embed chat API and websocket auth) always filters on
+is_active = true. The full btree on token is replaced by a partial index
+that only holds active tokens, so it stays small and hot in shared_buffers.
+
+The chat_window_id index stays a full index: listing tokens per chat window
+includes inactive ones, and the ON DELETE CASCADE from chat_windows needs it.
+
+Revision ID: 2215d56e08a9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2215d56e08a9'
+down_revision: Union[str, Sequence[str], None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the full token index with a partial index on active tokens."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_embed_tokens_token_active',
+            'embed_tokens',
+            ['token'],
+            unique=True,
+            postgresql_where=sa.text('is_active = true'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index('ix_embed_tokens_token', table_name='embed_tokens', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Restore the full token index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_embed_tokens_token',
+            'embed_tokens',
+            ['token'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index('ix_embed_tokens_token_active', table_name='embed_tokens', postgresql_concurrently=True, if_exists=True)
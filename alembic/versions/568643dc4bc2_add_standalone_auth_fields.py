@@ -20,33 +20,51 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Add standalone authentication fields to accounts table."""
-    # Rename cognito_id to external_user_id (generic for all auth providers)
-    op.alter_column('accounts', 'cognito_id', new_column_name='external_user_id')
-
-    # Add auth provider field
-    op.add_column('accounts', sa.Column('auth_provider', sa.String(length=50), nullable=False, server_default='cognito'))
-
-    # Add standalone auth fields
-    op.add_column('accounts', sa.Column('password_hash', sa.String(length=255), nullable=True))
-    op.add_column('accounts', sa.Column('email_verified', sa.Boolean(), nullable=False, server_default='false'))
-
-    # Add 2FA/TOTP fields
-    op.add_column('accounts', sa.Column('totp_secret', sa.String(length=255), nullable=True))
-    op.add_column('accounts', sa.Column('totp_enabled', sa.Boolean(), nullable=False, server_default='false'))
+    # Rename cognito_id to external_user_id (generic for all auth providers).
+    # Postgres does not allow RENAME next to other actions, so it is its own
+    # statement; all column adds share one ALTER TABLE (one lock, one catalog write).
+    #
+    # All NOT NULL columns use constant literal defaults, so Postgres 11+
+    # adds them as metadata-only changes without rewriting the accounts heap.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'accounts' AND column_name = 'cognito_id'
+            ) THEN
+                ALTER TABLE accounts RENAME COLUMN cognito_id TO external_user_id;
+            END IF;
+        END $$;
+        ALTER TABLE accounts
+            ADD COLUMN IF NOT EXISTS auth_provider VARCHAR(50) NOT NULL DEFAULT 'cognito',
+            ADD COLUMN IF NOT EXISTS password_hash VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS email_verified BOOLEAN NOT NULL DEFAULT false,
+            ADD COLUMN IF NOT EXISTS totp_secret VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS totp_enabled BOOLEAN NOT NULL DEFAULT false;
+        """
+    )
 
 
 def downgrade() -> None:
     """Remove standalone authentication fields from accounts table."""
-    # Drop 2FA fields
-    op.drop_column('accounts', 'totp_enabled')
-    op.drop_column('accounts', 'totp_secret')
-
-    # Drop standalone auth fields
-    op.drop_column('accounts', 'email_verified')
-    op.drop_column('accounts', 'password_hash')
-
-    # Drop auth provider field
-    op.drop_column('accounts', 'auth_provider')
-
-    # Rename external_user_id back to cognito_id
-    op.alter_column('accounts', 'external_user_id', new_column_name='cognito_id')
+    op.execute(
+        """
+        ALTER TABLE accounts
+            DROP COLUMN IF EXISTS totp_enabled,
+            DROP COLUMN IF EXISTS totp_secret,
+            DROP COLUMN IF EXISTS email_verified,
+            DROP COLUMN IF EXISTS password_hash,
+            DROP COLUMN IF EXISTS auth_provider;
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'accounts' AND column_name = 'external_user_id'
+            ) THEN
+                ALTER TABLE accounts RENAME COLUMN external_user_id TO cognito_id;
+            END IF;
+        END $$;
+        """
+    )
@@ -0,0 +1,49 @@
+"""Add section and field indexes concurrently
+
+Revision ID: 6be892e7f405
+Revises: 79e207c0e05c
+Create Date: 2025-10-31 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6be892e7f405'
+down_revision: Union[str, Sequence[str], None] = '79e207c0e05c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_database_connections_handle', 'database_connections', ['handle']),
+    ('ix_database_connections_project_id', 'database_connections', ['project_id']),
+    ('ix_sections_handle', 'sections', ['handle']),
+    ('ix_sections_project_id', 'sections', ['project_id']),
+    ('ix_section_migrations_section_id', 'section_migrations', ['section_id']),
+    ('ix_fields_handle', 'fields', ['handle']),
+    ('ix_fields_project_id', 'fields', ['project_id']),
+    ('ix_section_field_assignments_field_id', 'section_field_assignments', ['field_id']),
+    ('ix_section_field_assignments_section_id', 'section_field_assignments', ['section_id']),
+]
+
+
+def upgrade() -> None:
+    """Create indexes for the tables added in 79e207c0e05c.
+
+    CREATE INDEX CONCURRENTLY cannot run inside a transaction, so the indexes
+    are built in an autocommit block and do not block writers.
+    """
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Drop the indexes concurrently."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -1,7 +1,7 @@
 """Add layout_config to sections table
 
 Revision ID: 98373d07cd26
-Revises: 79e207c0e05c
+Revises: 6be892e7f405
 Create Date: 2025-10-31 13:11:45.027170
 
 """
@@ -14,7 +14,7 @@ from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision: str = '98373d07cd26'
-down_revision: Union[str, Sequence[str], None] = '79e207c0e05c'
+down_revision: Union[str, Sequence[str], None] = '6be892e7f405'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
@@ -26,9 +26,9 @@ def upgrade() -> None:
         postgresql.JSONB(astext_type=sa.Text()),
         nullable=False,
         server_default=sa.text("'{}'::jsonb")
-    ))
+    ), if_not_exists=True)
 
 
 def downgrade() -> None:
     """Remove layout_config column from sections table."""
-    op.drop_column('sections', 'layout_config')
+    op.drop_column('sections', 'layout_config', if_exists=True)
@@ -0,0 +1,50 @@
+"""Drop indexes covered by unique constraints
+
+Each of these single-column indexes is the leading column of a composite
+unique constraint on the same table, whose backing btree already serves
+lookups on that column:
+
+- ix_project_templates_project_id -> uq_project_templates_project_name (project_id, name)
+- ix_fields_project_id            -> uq_field_handle_per_project (project_id, handle)
+- ix_sections_project_id          -> uq_section_handle_per_project (project_id, handle)
+
+ix_embed_tokens_token, which duplicated uq_embed_tokens_token, was already
+dropped in 2215d56e08a9.
+
+Revision ID: 9f8adc4db5d7
+Revises: e96e65b15525
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f8adc4db5d7'
+down_revision: Union[str, Sequence[str], None] = 'e96e65b15525'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REDUNDANT_INDEXES = [
+    ('ix_project_templates_project_id', 'project_templates', ['project_id']),
+    ('ix_fields_project_id', 'fields', ['project_id']),
+    ('ix_sections_project_id', 'sections', ['project_id']),
+]
+
+
+def upgrade() -> None:
+    """Drop the redundant indexes concurrently."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Recreate the indexes concurrently."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(REDUNDANT_INDEXES):
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
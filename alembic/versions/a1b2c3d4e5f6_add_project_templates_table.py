@@ -31,25 +31,24 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(), nullable=False),
         sa.PrimaryKeyConstraint('id'),
         sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        # Unique constraint on (project_id, name)
+        sa.UniqueConstraint('project_id', 'name', name='uq_project_templates_project_name'),
+        if_not_exists=True
     )
 
-    # Create unique constraint on (project_id, name)
-    op.create_unique_constraint(
-        'uq_project_templates_project_name',
-        'project_templates',
-        ['project_id', 'name']
-    )
-
-    # Create index on project_id for faster lookups
-    op.create_index(
-        'ix_project_templates_project_id',
-        'project_templates',
-        ['project_id']
-    )
+    # Create index on project_id for faster lookups, concurrently so writers are not blocked
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_project_templates_project_id',
+            'project_templates',
+            ['project_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
 
 
 def downgrade() -> None:
     """Drop project_templates table."""
-    op.drop_index('ix_project_templates_project_id', table_name='project_templates')
-    op.drop_constraint('uq_project_templates_project_name', 'project_templates', type_='unique')
-    op.drop_table('project_templates')
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_project_templates_project_id', table_name='project_templates', postgresql_concurrently=True, if_exists=True)
+    op.drop_table('project_templates', if_exists=True)
@@ -0,0 +1,41 @@
+"""Store large text columns uncompressed
+
+section_migrations.migration_sql and project_templates.content are written
+once and always read in full. With STORAGE EXTERNAL, Postgres still moves
+large values out of line but skips pglz compression, so writes and reads do
+not pay for (de)compression.
+
+Smaller TEXT columns are left as they are: VARCHAR(n) and TEXT share the same
+on-disk representation and TOAST thresholds, so capping their length would
+not change how rows are stored.
+
+Revision ID: b0399a68e7be
+Revises: ee70576a46d1
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b0399a68e7be'
+down_revision: Union[str, Sequence[str], None] = 'ee70576a46d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Switch the large text columns to STORAGE EXTERNAL."""
+    op.execute("ALTER TABLE section_migrations ALTER COLUMN migration_sql SET STORAGE EXTERNAL")
+    op.execute("ALTER TABLE project_templates ALTER COLUMN content SET STORAGE EXTERNAL")
+    op.execute("ANALYZE section_migrations")
+    op.execute("ANALYZE project_templates")
+
+
+def downgrade() -> None:
+    """Restore the default EXTENDED storage."""
+    op.execute("ALTER TABLE project_templates ALTER COLUMN content SET STORAGE EXTENDED")
+    op.execute("ALTER TABLE section_migrations ALTER COLUMN migration_sql SET STORAGE EXTENDED")
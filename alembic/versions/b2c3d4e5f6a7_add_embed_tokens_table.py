@@ -44,33 +44,36 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id'),
         sa.ForeignKeyConstraint(['chat_window_id'], ['chat_windows.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
-    )
 
-    # Unique constraint on token
-    op.create_unique_constraint(
-        'uq_embed_tokens_token',
-        'embed_tokens',
-        ['token']
+        # Unique constraint on token
+        sa.UniqueConstraint('token', name='uq_embed_tokens_token'),
+        if_not_exists=True
     )
 
-    # Index for faster lookups by token
-    op.create_index(
-        'ix_embed_tokens_token',
-        'embed_tokens',
-        ['token']
-    )
-
-    # Index for lookups by chat_window_id
-    op.create_index(
-        'ix_embed_tokens_chat_window_id',
-        'embed_tokens',
-        ['chat_window_id']
-    )
+    # Indexes are built concurrently so writers are not blocked while they build
+    with op.get_context().autocommit_block():
+        # Index for faster lookups by token
+        op.create_index(
+            'ix_embed_tokens_token',
+            'embed_tokens',
+            ['token'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+        # Index for lookups by chat_window_id
+        op.create_index(
+            'ix_embed_tokens_chat_window_id',
+            'embed_tokens',
+            ['chat_window_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
 
 
 def downgrade() -> None:
     """Drop embed_tokens table."""
-    op.drop_index('ix_embed_tokens_chat_window_id', table_name='embed_tokens')
-    op.drop_index('ix_embed_tokens_token', table_name='embed_tokens')
-    op.drop_constraint('uq_embed_tokens_token', 'embed_tokens', type_='unique')
-    op.drop_table('embed_tokens')
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_embed_tokens_chat_window_id', table_name='embed_tokens', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_embed_tokens_token', table_name='embed_tokens', postgresql_concurrently=True, if_exists=True)
+    op.drop_table('embed_tokens', if_exists=True)
@@ -24,10 +24,10 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Remove ui_width column from section_field_assignments."""
-    op.drop_column('section_field_assignments', 'ui_width')
+    op.drop_column('section_field_assignments', 'ui_width', if_exists=True)
 
 
 def downgrade() -> None:
     """Re-add ui_width column to section_field_assignments."""
     op.add_column('section_field_assignments',
-        sa.Column('ui_width', sa.String(length=20), nullable=False, server_default='full'))
+        sa.Column('ui_width', sa.String(length=20), nullable=False, server_default='full'), if_not_exists=True)
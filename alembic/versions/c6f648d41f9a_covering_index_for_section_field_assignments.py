@@ -0,0 +1,63 @@
+"""Covering index for section_field_assignments
+
+Assignments are always read per section, ordered by sort_order. The plain
+section_id index is replaced by a (section_id, sort_order) index that INCLUDEs
+the layout columns, so the lookup and the sort come from one index walk and
+the layout columns can be served by index-only scans.
+
+ix_section_field_assignments_field_id stays: the ON DELETE CASCADE from
+fields needs an index that leads with field_id.
+
+Revision ID: c6f648d41f9a
+Revises: 2215d56e08a9
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f648d41f9a'
+down_revision: Union[str, Sequence[str], None] = '2215d56e08a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the section_id index with a covering (section_id, sort_order) index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_section_field_assignments_section_id_sort_order',
+            'section_field_assignments',
+            ['section_id', 'sort_order'],
+            postgresql_include=['field_id', 'tab_name', 'is_visible', 'is_required_override'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_section_field_assignments_section_id',
+            table_name='section_field_assignments',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Restore the plain section_id index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_section_field_assignments_section_id',
+            'section_field_assignments',
+            ['section_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_section_field_assignments_section_id_sort_order',
+            table_name='section_field_assignments',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,47 @@
+"""Covering index for chat_window_access by account
+
+The my-chat-windows overview reads every access row of one account together
+with its permission flags, then joins chat_windows, projects and tenants on
+their primary keys. This index lets the access side be answered by an
+index-only scan, so the only heap pages read are the three PK lookups.
+
+Revision ID: cd9ec0946b40
+Revises: 9f8adc4db5d7
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cd9ec0946b40'
+down_revision: Union[str, Sequence[str], None] = '9f8adc4db5d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the covering account_id index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_chat_window_access_account_id_covering',
+            'chat_window_access',
+            ['account_id'],
+            postgresql_include=['chat_window_id', 'can_view_flow', 'can_view_output', 'show_response_transparency'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Drop the covering account_id index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_chat_window_access_account_id_covering',
+            table_name='chat_window_access',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
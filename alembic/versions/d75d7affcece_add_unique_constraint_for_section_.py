@@ -21,12 +21,21 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.create_unique_constraint('uq_section_handle_per_project', 'sections', ['project_id', 'handle'])
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_section_handle_per_project') THEN
+                ALTER TABLE sections ADD CONSTRAINT uq_section_handle_per_project UNIQUE (project_id, handle);
+            END IF;
+        END $$;
+        """
+    )
     # ### end Alembic commands ###
 
 
 def downgrade() -> None:
     """Downgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_constraint('uq_section_handle_per_project', 'sections', type_='unique')
+    op.drop_constraint('uq_section_handle_per_project', 'sections', type_='unique', if_exists=True)
     # ### end Alembic commands ###
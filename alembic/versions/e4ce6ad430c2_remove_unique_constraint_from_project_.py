@@ -22,7 +22,7 @@ def upgrade() -> None:
     """Upgrade schema."""
     # Drop unique constraint on project name
     # Different tenants should be able to have projects with the same name
-    op.drop_constraint('projects_name_key', 'projects', type_='unique')
+    op.drop_constraint('projects_name_key', 'projects', type_='unique', if_exists=True)
 
 
 def downgrade() -> None:
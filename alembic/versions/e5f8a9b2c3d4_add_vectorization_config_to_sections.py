@@ -20,9 +20,9 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Add vectorization_config JSONB column to sections table."""
-    op.add_column('sections', sa.Column('vectorization_config', postgresql.JSONB, nullable=True))
+    op.add_column('sections', sa.Column('vectorization_config', postgresql.JSONB, nullable=True), if_not_exists=True)
 
 
 def downgrade() -> None:
     """Remove vectorization_config column from sections table."""
-    op.drop_column('sections', 'vectorization_config')
+    op.drop_column('sections', 'vectorization_config', if_exists=True)
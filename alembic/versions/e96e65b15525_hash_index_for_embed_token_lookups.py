@@ -0,0 +1,55 @@
+"""Hash index for embed token lookups
+
+Token verification is an exact-match lookup only. A hash index stores a
+4-byte hash per entry instead of the full token, so the partial lookup index
+on active tokens becomes a fraction of the btree's size.
+
+Hash indexes cannot be unique; uniqueness stays enforced by the
+uq_embed_tokens_token constraint.
+
+Revision ID: e96e65b15525
+Revises: b0399a68e7be
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e96e65b15525'
+down_revision: Union[str, Sequence[str], None] = 'b0399a68e7be'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the partial btree on active tokens with a partial hash index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_embed_tokens_token_hash',
+            'embed_tokens',
+            ['token'],
+            postgresql_using='hash',
+            postgresql_where=sa.text('is_active = true'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index('ix_embed_tokens_token_active', table_name='embed_tokens', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Restore the partial btree on active tokens."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_embed_tokens_token_active',
+            'embed_tokens',
+            ['token'],
+            unique=True,
+            postgresql_where=sa.text('is_active = true'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index('ix_embed_tokens_token_hash', table_name='embed_tokens', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,54 @@
+"""Convert accounts.auth_provider to a native enum
+
+Revision ID: ee70576a46d1
+Revises: c6f648d41f9a
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ee70576a46d1'
+down_revision: Union[str, Sequence[str], None] = 'c6f648d41f9a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store auth_provider as a 4-byte enum instead of VARCHAR(50)."""
+    # Same pattern as accountrole in 15c5f5e78d09: native postgres ENUM with explicit values
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            CREATE TYPE authprovider AS ENUM ('cognito', 'standalone');
+        EXCEPTION
+            WHEN duplicate_object THEN NULL;
+        END $$;
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE accounts
+            ALTER COLUMN auth_provider DROP DEFAULT,
+            ALTER COLUMN auth_provider TYPE authprovider USING auth_provider::authprovider,
+            ALTER COLUMN auth_provider SET DEFAULT 'cognito'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Convert auth_provider back to VARCHAR(50)."""
+    op.execute(
+        """
+        ALTER TABLE accounts
+            ALTER COLUMN auth_provider DROP DEFAULT,
+            ALTER COLUMN auth_provider TYPE VARCHAR(50) USING auth_provider::text,
+            ALTER COLUMN auth_provider SET DEFAULT 'cognito'
+        """
+    )
+    op.execute("DROP TYPE IF EXISTS authprovider")
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Response, status, BackgroundTasks
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from db.session import get_db
@@ -19,6 +20,57 @@ from utils.get_current_account import get_current_account
 
 router = APIRouter()
 
+# Adapters are built once at import; routes return pre-encoded JSON so FastAPI
+# does not re-validate and re-encode the response. response_model stays for the docs.
+_ACCOUNT_OUT = TypeAdapter(AccountOut)
+_TENANT_USERS_OUT = TypeAdapter(list[TenantUserOut])
+
+
+def _json_response(adapter: TypeAdapter, value, status_code: int = status.HTTP_200_OK) -> Response:
+    payload = adapter.validate_python(value, from_attributes=True)
+    return Response(content=adapter.dump_json(payload), media_type="application/json", status_code=status_code)
+
+
+# Starlette matches routes in declaration order, so the most requested GETs
+# come first. /tenant/ must stay ahead of /{account_identifier}/, which would
+# otherwise capture it.
+@router.get("/tenant/", response_model=List[TenantUserOut])
+def list_tenant_users(
+    current_account: Account = Depends(get_current_account),
+    session: Session = Depends(get_db)
+):
+    users = AccountService.get_users_for_tenant(session, current_account)
+    return _json_response(_TENANT_USERS_OUT, users)
+
+
+@router.get("/{account_identifier}/", response_model=AccountOut)
+def get_account(
+    account_identifier: str,
+    session: Session = Depends(get_db)
+):
+    """Get account by external_user_id or UUID (primary key).
+
+    This endpoint supports both identifiers for backwards compatibility:
+    - external_user_id: Auth provider's user ID (most common, from JWT token)
+    - UUID: Account's primary key (legacy support)
+    """
+    # First try external_user_id lookup (most common case - from JWT token)
+    account = AccountService.get_by_external_user_id(session, account_identifier)
+
+    # If not found and identifier is a valid UUID, try primary key lookup
+    if not account:
+        try:
+            UUID(account_identifier)
+            account = AccountService.get_by_id(session, account_identifier)
+        except ValueError:
+            # Not a valid UUID, no other options
+            pass
+
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return _json_response(_ACCOUNT_OUT, account)
+
+
 @router.post("/", response_model=AccountOut, status_code=status.HTTP_201_CREATED)
 def create_account(
     data: AccountCreate,
@@ -26,7 +78,7 @@ def create_account(
     session: Session = Depends(get_db)
 ):
     account = AccountService.create_account_with_tenant(session, data.model_dump(), background_tasks)
-    return account
+    return _json_response(_ACCOUNT_OUT, account, status.HTTP_201_CREATED)
 
 
 @router.post("/activate/{cognito_id}/", response_model=AccountOut)
@@ -36,9 +88,10 @@ def activate_account(
     session: Session = Depends(get_db),
 ):
     try:
-        return AccountService.activate_account(session, cognito_id, data.first_name, data.last_name)
+        account = AccountService.activate_account(session, cognito_id, data.first_name, data.last_name)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return _json_response(_ACCOUNT_OUT, account)
 
 
 @router.post("/invite/", response_model=AccountOut)
@@ -55,15 +108,7 @@ def invite_account(
         background_tasks=background_tasks,
         role=data.role.value,
     )
-    return account
-
-
-@router.get("/tenant/", response_model=List[TenantUserOut])
-def list_tenant_users(
-    current_account: Account = Depends(get_current_account),
-    session: Session = Depends(get_db)
-):
-    return AccountService.get_users_for_tenant(session, current_account)
+    return _json_response(_ACCOUNT_OUT, account)
 
 
 @router.post("/resend-invitation/{account_id}/")
@@ -80,33 +125,6 @@ def resend_invite(
     )
     return {"message": "Invitation email successfully resent"}
 
-@router.get("/{account_identifier}/", response_model=AccountOut)
-def get_account(
-    account_identifier: str,
-    session: Session = Depends(get_db)
-):
-    """Get account by external_user_id or UUID (primary key).
-
-    This endpoint supports both identifiers for backwards compatibility:
-    - external_user_id: Auth provider's user ID (most common, from JWT token)
-    - UUID: Account's primary key (legacy support)
-    """
-    # First try external_user_id lookup (most common case - from JWT token)
-    account = AccountService.get_by_external_user_id(session, account_identifier)
-
-    # If not found and identifier is a valid UUID, try primary key lookup
-    if not account:
-        try:
-            UUID(account_identifier)
-            account = AccountService.get_by_id(session, account_identifier)
-        except ValueError:
-            # Not a valid UUID, no other options
-            pass
-
-    if not account:
-        raise HTTPException(status_code=404, detail="Account not found")
-    return account
-
 
 @router.patch("/{account_id}/", response_model=AccountOut)
 def update_account(
@@ -116,13 +134,14 @@ def update_account(
     session: Session = Depends(get_db)
 ):
     # Only allow users to update their own account (or admins to update any)
-    if str(current_account.id) != str(account_id) and current_account.role != "admin":
+    if current_account.id != account_id and current_account.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to update this account")
 
     try:
-        return AccountService.update_account(session, str(account_id), data.model_dump(exclude_unset=True))
+        account = AccountService.update_account(session, account_id, data.model_dump(exclude_unset=True))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    return _json_response(_ACCOUNT_OUT, account)
 
 
 @router.delete("/{account_id}/")
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from pydantic import TypeAdapter
 
 from models import Account
 from repositories.chat_window_access_repository import (
@@ -10,6 +11,10 @@ from utils.get_current_account import get_current_account
 
 router = APIRouter()
 
+# Rows come straight from the database, so the models are built with
+# model_construct (no validation) and serialized in one pass by this adapter.
+_MY_CHAT_WINDOWS_ADAPTER = TypeAdapter(list[MyChatWindowOut])
+
 
 @router.get("/my-chat-windows/", response_model=list[MyChatWindowOut])
 def get_my_chat_windows(
@@ -23,32 +28,35 @@ def get_my_chat_windows(
     This is cross-tenant and cross-project - returns all chat windows
     the user has been assigned to, regardless of tenant or project.
     """
-    accesses = access_repository.get_chat_windows_with_details_for_account(account.id)
+    rows = access_repository.get_chat_windows_with_details_for_account(account.id)
 
-    result = []
-    for access in accesses:
-        if access.chat_window and access.chat_window.project:
-            result.append(
-                MyChatWindowOut(
-                    chat_window=ChatWindowSimpleOut(
-                        id=access.chat_window.id,
-                        name=access.chat_window.name,
-                        description=access.chat_window.description,
-                    ),
-                    project=ProjectSimpleOut(
-                        id=access.chat_window.project.id,
-                        name=access.chat_window.project.name,
-                    ),
-                    tenant=TenantSimpleOut(
-                        id=access.chat_window.project.tenant.id,
-                        name=access.chat_window.project.tenant.name,
-                    ),
-                    permissions=PermissionsOut(
-                        can_view_flow=access.can_view_flow,
-                        can_view_output=access.can_view_output,
-                        show_response_transparency=access.show_response_transparency,
-                    ),
-                )
-            )
+    result = [
+        MyChatWindowOut.model_construct(
+            chat_window=ChatWindowSimpleOut.model_construct(
+                id=row.chat_window_id,
+                name=row.chat_window_name,
+                description=row.chat_window_description,
+            ),
+            project=ProjectSimpleOut.model_construct(
+                id=row.project_id,
+                name=row.project_name,
+            ),
+            tenant=TenantSimpleOut.model_construct(
+                id=row.tenant_id,
+                name=row.tenant_name,
+            ),
+            permissions=PermissionsOut.model_construct(
+                can_view_flow=row.can_view_flow,
+                can_view_output=row.can_view_output,
+                show_response_transparency=row.show_response_transparency,
+            ),
+        )
+        for row in rows
+    ]
 
-    return result
+    # Returning a Response skips FastAPI's response_model re-validation;
+    # response_model is kept for the OpenAPI schema.
+    return Response(
+        content=_MY_CHAT_WINDOWS_ADAPTER.dump_json(result, by_alias=True),
+        media_type="application/json",
+    )
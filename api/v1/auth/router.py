@@ -4,7 +4,17 @@ Provides endpoints for user registration, login, password management, and 2FA.
 Only active when SAAS_MODE=False.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import asyncio
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+import unicodedata
+
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 import pyotp
 import qrcode
@@ -29,8 +39,9 @@ from schemas.auth import (
     Verify2FARequest,
     MessageResponse,
 )
+from services.account_service import AccountService
 from services.email.email_service import EmailService
-from utils.get_current_account import get_current_account
+from utils.get_current_account import get_current_account, get_current_token_payload
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -40,28 +51,117 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 # Helper Functions
 # ============================================================================
 
+_standalone_provider: StandaloneAuthProvider | None = None
+_dummy_password_hash: str | None = None
+
+
 def get_standalone_provider() -> StandaloneAuthProvider:
     """Get standalone auth provider (only works in standalone mode)."""
+    global _standalone_provider, _dummy_password_hash
+
     if settings.SAAS_MODE:
         raise HTTPException(
             status_code=400,
             detail="Authentication endpoints are only available in standalone mode"
         )
-    provider = get_auth_provider()
-    if not isinstance(provider, StandaloneAuthProvider):
-        raise HTTPException(status_code=500, detail="Invalid auth provider configuration")
-    return provider
+
+    # The provider is fixed for the life of the process, so check it once
+    if _standalone_provider is None:
+        provider = get_auth_provider()
+        if not isinstance(provider, StandaloneAuthProvider):
+            raise HTTPException(status_code=500, detail="Invalid auth provider configuration")
+        # Hashed up front, so no login ever pays for creating it
+        _dummy_password_hash = provider.hash_password(secrets.token_urlsafe(16))
+        _standalone_provider = provider
+    return _standalone_provider
+
+
+def check_password(provider: StandaloneAuthProvider, password: str, password_hash: str | None) -> bool:
+    """Verify a password against a stored hash.
+
+    Without a hash the password is checked against a dummy hash and rejected,
+    so a login for an unknown email costs exactly one verify, like a wrong
+    password.
+    """
+    if password_hash is None:
+        provider.verify_password(password, _dummy_password_hash)
+        return False
+    return provider.verify_password(password, password_hash)
+
+
+# Keyed HMAC contexts by SHA-256 of the TOTP secret, so the cache keys are not
+# the secrets themselves; entries expire shortly after a user's last login
+_totp_hmacs = TTLCache(maxsize=10_000, ttl=300)
+_totp_hmacs_lock = threading.Lock()
+
+
+def _totp_cache_key(secret: str) -> bytes:
+    return hashlib.sha256(secret.encode("utf-8")).digest()
+
+
+def _totp_hmac(secret: str) -> hmac.HMAC:
+    """HMAC-SHA1 context keyed with a TOTP secret, copied for every time step."""
+    cache_key = _totp_cache_key(secret)
+    with _totp_hmacs_lock:
+        mac = _totp_hmacs.get(cache_key)
+    if mac is None:
+        key = base64.b32decode(secret + "=" * (-len(secret) % 8), casefold=True)
+        mac = hmac.new(key, digestmod=hashlib.sha1)
+        with _totp_hmacs_lock:
+            _totp_hmacs[cache_key] = mac
+    return mac
+
+
+def _forget_totp_secret(secret: str) -> None:
+    """Drop the cached HMAC context for a secret that is no longer in use."""
+    with _totp_hmacs_lock:
+        _totp_hmacs.pop(_totp_cache_key(secret), None)
+
+
+def _totp_code(mac: hmac.HMAC, counter: int) -> bytes:
+    """RFC 4226 truncation of the HMAC over one counter value, as 6 digits."""
+    step = mac.copy()
+    step.update(counter.to_bytes(8, "big"))
+    digest = step.digest()
+    offset = digest[-1] & 0x0F
+    code = (int.from_bytes(digest[offset:offset + 4], "big") & 0x7FFFFFFF) % 1_000_000
+    return b"%06d" % code
+
+
+def verify_totp(secret: str, code: str) -> bool:
+    """Verify a TOTP code against the previous, current and next time step.
+
+    Unlike TOTP.verify, all three codes are always generated and compared, so
+    the response time does not reveal which step matched. The keyed HMAC is
+    cached per secret, so each step only hashes its counter.
+    """
+    mac = _totp_hmac(secret)
+    counter = int(time.time()) // 30
+    code_bytes = unicodedata.normalize("NFKC", code).encode("utf-8")
+    valid = False
+    for offset in (-1, 0, 1):
+        valid |= hmac.compare_digest(code_bytes, _totp_code(mac, counter + offset))
+    return valid
+
+
+def provisioning_uri(secret: str, email: str) -> str:
+    """otpauth:// URI for adding the TOTP secret to an authenticator app."""
+    return pyotp.totp.TOTP(secret).provisioning_uri(name=email, issuer_name="PolySynergy")
+
+
+def render_qr_code(data: str) -> str:
+    """Render data as a QR code PNG, base64 encoded."""
+    qr = qrcode.make(data)
+    buffer = BytesIO()
+    qr.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
 
 
 def generate_backup_codes(count: int = 8) -> list[str]:
     """Generate backup codes for 2FA recovery."""
-    import secrets
-    import string
-    codes = []
-    for _ in range(count):
-        code = ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(8))
-        codes.append(f"{code[:4]}-{code[4:]}")
-    return codes
+    # 5 random bytes encode to exactly 8 base32 characters (A-Z, 2-7), one code each
+    encoded = base64.b32encode(secrets.token_bytes(count * 5)).decode()
+    return [f"{encoded[i:i + 4]}-{encoded[i + 4:i + 8]}" for i in range(0, len(encoded), 8)]
 
 
 # ============================================================================
@@ -71,7 +171,6 @@ def generate_backup_codes(count: int = 8) -> list[str]:
 @router.post("/register", response_model=MessageResponse, status_code=201)
 async def register(
     data: RegisterRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Register a new user account (standalone mode only).
@@ -84,7 +183,7 @@ async def register(
     provider = get_standalone_provider()
 
     # Check if email already exists
-    existing = db.query(Account).filter(Account.email == data.email).first()
+    existing = AccountService.get_by_email(db, data.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
@@ -96,7 +195,7 @@ async def register(
     )
 
     # Hash password
-    password_hash = provider.hash_password(data.password)
+    password_hash = await asyncio.to_thread(provider.hash_password, data.password)
 
     # Create account
     account = Account(
@@ -115,7 +214,7 @@ async def register(
 
     # For standalone mode: ensure user has a tenant
     # Get or create a default tenant
-    default_tenant = db.query(Tenant).filter(Tenant.name == "Default").first()
+    default_tenant = db.scalar(select(Tenant).where(Tenant.name == "Default").limit(1))
     if not default_tenant:
         default_tenant = Tenant(name="Default")
         db.add(default_tenant)
@@ -140,8 +239,7 @@ async def register(
     EmailService.send_email_verification(
         to=account.email,
         first_name=account.first_name,
-        verification_url=verification_url,
-        background_tasks=background_tasks
+        verification_url=verification_url
     )
 
     return MessageResponse(
@@ -161,12 +259,11 @@ async def login(
     provider = get_standalone_provider()
 
     # Find account
-    account = db.query(Account).filter(Account.email == data.email).first()
-    if not account or account.auth_provider != "standalone":
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    account = AccountService.get_login_credentials(db, data.email)
+    password_hash = account.password_hash if account and account.auth_provider == "standalone" else None
 
-    # Verify password
-    if not account.password_hash or not provider.verify_password(data.password, account.password_hash):
+    # Verify password; unknown emails still pay for one bcrypt round
+    if not await asyncio.to_thread(check_password, provider, data.password, password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     # Check if account is active
@@ -182,8 +279,7 @@ async def login(
                 headers={"X-2FA-Required": "true"}
             )
 
-        totp = pyotp.TOTP(account.totp_secret)
-        if not totp.verify(data.totp_code, valid_window=1):
+        if not verify_totp(account.totp_secret, data.totp_code):
             raise HTTPException(status_code=401, detail="Invalid 2FA code")
 
     # Generate tokens
@@ -222,8 +318,7 @@ async def refresh_token(
     email = decoded.get("email")
 
     # Verify account still exists
-    account = db.query(Account).filter(Account.external_user_id == user_id).first()
-    if not account or not account.active:
+    if not AccountService.is_active_external_user(db, user_id):
         raise HTTPException(status_code=401, detail="Account not found or inactive")
 
     # Generate new tokens
@@ -238,7 +333,7 @@ async def refresh_token(
 
 @router.post("/logout", response_model=MessageResponse)
 async def logout(
-    account: Account = Depends(get_current_account)
+    _: dict = Depends(get_current_token_payload)
 ):
     """Logout (standalone mode).
 
@@ -271,7 +366,7 @@ async def verify_email(
     user_id = decoded.get("sub")
 
     # Update account
-    account = db.query(Account).filter(Account.external_user_id == user_id).first()
+    account = AccountService.get_by_external_user_id(db, user_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
@@ -291,14 +386,13 @@ async def verify_email(
 @router.post("/forgot-password", response_model=MessageResponse)
 async def forgot_password(
     data: ForgotPasswordRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Request password reset email (standalone mode only)."""
     provider = get_standalone_provider()
 
     # Find account (don't reveal if email exists or not)
-    account = db.query(Account).filter(Account.email == data.email).first()
+    account = AccountService.get_by_email(db, data.email)
     if account and account.auth_provider == "standalone":
         # Generate reset token
         reset_token = provider.create_password_reset_token(
@@ -311,8 +405,7 @@ async def forgot_password(
         EmailService.send_password_reset(
             to=account.email,
             first_name=account.first_name,
-            reset_url=reset_url,
-            background_tasks=background_tasks
+            reset_url=reset_url
         )
 
     # Always return success (don't reveal if email exists)
@@ -339,12 +432,14 @@ async def reset_password(
 
     user_id = decoded.get("sub")
 
-    # Update password
-    account = db.query(Account).filter(Account.external_user_id == user_id).first()
-    if not account:
+    # Update password in one statement, without loading the account
+    password_hash = await asyncio.to_thread(provider.hash_password, data.new_password)
+    result = db.execute(
+        update(Account).where(Account.external_user_id == user_id).values(password_hash=password_hash)
+    )
+    if result.rowcount == 0:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Account not found")
-
-    account.password_hash = provider.hash_password(data.new_password)
     db.commit()
 
     return MessageResponse(message="Password reset successfully")
@@ -366,11 +461,13 @@ async def change_password(
         )
 
     # Verify current password
-    if not account.password_hash or not provider.verify_password(data.current_password, account.password_hash):
+    if not account.password_hash or not await asyncio.to_thread(
+        provider.verify_password, data.current_password, account.password_hash
+    ):
         raise HTTPException(status_code=401, detail="Current password is incorrect")
 
     # Update password
-    account.password_hash = provider.hash_password(data.new_password)
+    account.password_hash = await asyncio.to_thread(provider.hash_password, data.new_password)
     db.commit()
 
     return MessageResponse(message="Password changed successfully")
@@ -400,33 +497,48 @@ async def enable_2fa(
     if account.totp_enabled:
         raise HTTPException(status_code=400, detail="2FA is already enabled")
 
-    # Generate TOTP secret
-    secret = pyotp.random_base32()
-    account.totp_secret = secret
-    db.commit()
+    # Repeated calls before /2fa/verify reuse the pending secret and its QR code
+    if not account.totp_secret or not account.totp_qr_code:
+        secret = pyotp.random_base32()
 
-    # Generate QR code
-    totp_uri = pyotp.totp.TOTP(secret).provisioning_uri(
-        name=account.email,
-        issuer_name="PolySynergy"
-    )
-
-    qr = qrcode.make(totp_uri)
-    buffer = BytesIO()
-    qr.save(buffer, format="PNG")
-    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
+        # Rendering the PNG is CPU-bound image work; keep it off the event loop
+        account.totp_qr_code = await asyncio.to_thread(render_qr_code, provisioning_uri(secret, account.email))
+        account.totp_secret = secret
+        db.commit()
 
     # Generate backup codes
     backup_codes = generate_backup_codes()
     # TODO: Store hashed backup codes in database
 
     return Enable2FAResponse(
-        secret=secret,
-        qr_code=qr_base64,
+        secret=account.totp_secret,
+        otpauth_uri=provisioning_uri(account.totp_secret, account.email),
+        qr_code=account.totp_qr_code,
         backup_codes=backup_codes
     )
 
 
+@router.get("/2fa/qr", response_class=Response)
+async def get_2fa_qr_code(
+    account: Account = Depends(get_current_account)
+):
+    """Get the QR code of the pending 2FA setup as a PNG image (standalone mode only).
+
+    Same image as the base64 qr_code from /2fa/enable, without the base64
+    overhead in the JSON body.
+    """
+    get_standalone_provider()  # Verify standalone mode
+
+    if account.totp_enabled or not account.totp_qr_code:
+        raise HTTPException(status_code=404, detail="No pending 2FA setup. Call /2fa/enable first")
+
+    return Response(
+        content=base64.b64decode(account.totp_qr_code),
+        media_type="image/png",
+        headers={"Cache-Control": "no-store"}
+    )
+
+
 @router.post("/2fa/verify", response_model=MessageResponse)
 async def verify_2fa(
     data: Verify2FARequest,
@@ -446,12 +558,12 @@ async def verify_2fa(
         raise HTTPException(status_code=400, detail="2FA setup not started. Call /2fa/enable first")
 
     # Verify TOTP code
-    totp = pyotp.TOTP(account.totp_secret)
-    if not totp.verify(data.totp_code, valid_window=1):
+    if not verify_totp(account.totp_secret, data.totp_code):
         raise HTTPException(status_code=401, detail="Invalid 2FA code")
 
-    # Activate 2FA
+    # Activate 2FA; the QR code is only needed while setup is pending
     account.totp_enabled = True
+    account.totp_qr_code = None
     db.commit()
 
     return MessageResponse(message="2FA enabled successfully")
@@ -476,12 +588,18 @@ async def disable_2fa(
         raise HTTPException(status_code=400, detail="2FA is not enabled")
 
     # Verify password
-    if not account.password_hash or not provider.verify_password(data.current_password, account.password_hash):
+    if not account.password_hash or not await asyncio.to_thread(
+        provider.verify_password, data.current_password, account.password_hash
+    ):
         raise HTTPException(status_code=401, detail="Password is incorrect")
 
     # Disable 2FA
+    old_secret = account.totp_secret
     account.totp_enabled = False
     account.totp_secret = None
+    account.totp_qr_code = None
     db.commit()
 
+    _forget_totp_secret(old_secret)
+
     return MessageResponse(message="2FA disabled successfully")
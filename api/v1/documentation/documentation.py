@@ -1,4 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query, Path
+import gzip
+import json
+from functools import lru_cache
+
+from fastapi import APIRouter, HTTPException, Query, Path, Request, Response
 from fastapi.responses import FileResponse
 from typing import Optional, List
 from services.documentation_service import DocumentationService
@@ -6,13 +10,84 @@ from pathlib import Path as PathLib
 
 router = APIRouter()
 
+# Encoded /documentation/ payloads, keyed by the documentation source version
+_all_documentation_cache: dict = {"version": None, "json": b"", "gzip": b""}
+
+# Seconds between scans of the documentation tree for changes. The scan stats
+# every file and runs on the event loop, so it is not done on every request.
+DOCUMENTATION_REFRESH_INTERVAL = 5.0
+
+
+@lru_cache(maxsize=1)
+def _shared_documentation_service() -> DocumentationService:
+    return DocumentationService("/documentation", refresh_interval=DOCUMENTATION_REFRESH_INTERVAL)
+
+
+def _documentation_service() -> DocumentationService:
+    """Shared service for the mounted documentation directory.
+
+    The service caches the manifest and search index on the instance, so
+    reusing one instance keeps them warm across requests. The caches are
+    dropped when a documentation file changes, noticed within
+    DOCUMENTATION_REFRESH_INTERVAL seconds.
+    """
+    documentation_service = _shared_documentation_service()
+    documentation_service.refresh_if_changed()
+    return documentation_service
+
+
+def warm_documentation_cache() -> None:
+    """Build the shared service's search index once, at startup."""
+    _shared_documentation_service().warm()
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows a gzip response.
+
+    An explicit gzip (or x-gzip) entry wins over "*"; a q-value of 0 refuses
+    the coding. A q-value that does not parse counts as a refusal.
+    """
+    gzip_q = wildcard_q = None
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            gzip_q = q if gzip_q is None else max(gzip_q, q)
+        elif coding == "*":
+            wildcard_q = q
+    if gzip_q is None:
+        gzip_q = wildcard_q
+    return gzip_q is not None and gzip_q > 0
+
+
 @router.get("/")
-async def get_all_documentation():
+async def get_all_documentation(request: Request):
     """Get all documentation including guides and nodes."""
     try:
-        # Use the mounted documentation directory
-        documentation_service = DocumentationService("/documentation")
-        return documentation_service.get_all_documentation()
+        documentation_service = _shared_documentation_service()
+        version = documentation_service.refresh_if_changed()
+
+        if _all_documentation_cache["version"] != version:
+            body = json.dumps(
+                documentation_service.get_all_documentation(),
+                ensure_ascii=False,
+                separators=(",", ":")
+            ).encode("utf-8")
+            _all_documentation_cache.update(version=version, json=body, gzip=gzip.compress(body, compresslevel=6))
+
+        headers = {"Vary": "Accept-Encoding"}
+        if _accepts_gzip(request.headers.get("accept-encoding", "")):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=_all_documentation_cache["gzip"], media_type="application/json", headers=headers)
+        return Response(content=_all_documentation_cache["json"], media_type="application/json", headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading documentation: {str(e)}")
 
@@ -20,7 +95,7 @@ async def get_all_documentation():
 async def get_categories():
     """Get all documentation categories."""
     try:
-        documentation_service = DocumentationService("/documentation")
+        documentation_service = _documentation_service()
         return {
             "categories": documentation_service.get_categories()
         }
@@ -34,7 +109,7 @@ async def search_documentation(
 ):
     """Search through all documentation."""
     try:
-        documentation_service = DocumentationService("/documentation")
+        documentation_service = _documentation_service()
         results = documentation_service.search(q, limit)
         return {
             "query": q,
@@ -50,7 +125,7 @@ async def get_category_documentation(
 ):
     """Get all documentation for a specific category."""
     try:
-        documentation_service = DocumentationService("/documentation")
+        documentation_service = _documentation_service()
         docs = documentation_service.get_documentation_by_category(category)
         if not docs and category not in ["guides", "tutorials", "reference"]:
             raise HTTPException(status_code=404, detail=f"Category '{category}' not found")
@@ -72,7 +147,7 @@ async def get_document(
 ):
     """Get a specific document."""
     try:
-        documentation_service = DocumentationService("/documentation")
+        documentation_service = _documentation_service()
         doc = documentation_service.get_document(category, doc_id)
         if not doc:
             raise HTTPException(status_code=404, detail=f"Document '{doc_id}' not found in category '{category}'")
@@ -1,3 +1,6 @@
+import threading
+
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, Query, HTTPException
 
 from models import Project
@@ -10,6 +13,54 @@ from utils.get_current_account import get_project_or_403
 
 router = APIRouter()
 
+# Repeat reads of a node result while browsing a run are served from memory.
+# Results are written once per (run, node, order), except when a paused run is
+# resumed under the same run_id; resume_flow drops that run's entries through
+# forget_node_results. Misses are not cached: a live run may write the result
+# right after it was asked for.
+_node_results = TTLCache(maxsize=2048, ttl=60)
+_node_results_lock = threading.Lock()
+
+
+def _get_cached_node_result(storage, key: tuple):
+    with _node_results_lock:
+        if key in _node_results:
+            return _node_results[key]
+
+    data = storage.get_node_result(*key)
+
+    if data is not None:
+        with _node_results_lock:
+            _node_results[key] = data
+    return data
+
+
+def forget_node_results(flow_id: str, run_id: str | None = None) -> None:
+    """Drop cached node results of a flow, or of one of its runs."""
+    with _node_results_lock:
+        for key in list(_node_results.keys()):
+            if key[0] == flow_id and (run_id is None or key[1] == run_id):
+                _node_results.pop(key, None)
+
+
+def _to_mock_node(node: dict, run_id: str) -> dict:
+    node_data = node.get('data', {})
+    order = node_data.get('order', node['order'])
+    killed = node_data.get('killed', False)
+
+    return {
+        "id": f"{node_data.get('node_id', node['node_id'])}-{order}",
+        "handle": node_data.get('handle', ''),
+        "order": order,
+        "type": node_data.get('type', 'Unknown'),
+        "killed": killed,
+        "runId": node_data.get('run_id', run_id),
+        "started": True,
+        "variables": node_data.get('variables', {}),
+        "status": "killed" if killed else ("error" if node_data.get('error') else "success")
+    }
+
+
 @router.get("/{flow_id}/{run_id}/{node_id}/{order}")
 def get_node_result(
     flow_id: str,
@@ -21,7 +72,7 @@ def get_node_result(
     storage: DynamoDbExecutionStorageService = Depends(get_execution_storage_service),
 ):
     try:
-        data = storage.get_node_result(flow_id, run_id, node_id, order, stage, sub_stage)
+        data = _get_cached_node_result(storage, (flow_id, run_id, node_id, order, stage, sub_stage))
         if data is None:
             raise HTTPException(status_code=404, detail="No result found")
         return data
@@ -89,22 +140,7 @@ def get_mock_nodes(
         nodes = storage.get_all_nodes_for_run(flow_id, run_id, stage, sub_stage)
 
         # Convert to mock node format expected by frontend
-        mock_nodes = []
-        for node in nodes:
-            node_data = node.get('data', {})
-
-            mock_node = {
-                "id": f"{node_data.get('node_id', node['node_id'])}-{node_data.get('order', node['order'])}",
-                "handle": node_data.get('handle', ''),
-                "order": node_data.get('order', node['order']),
-                "type": node_data.get('type', 'Unknown'),
-                "killed": node_data.get('killed', False),
-                "runId": node_data.get('run_id', run_id),
-                "started": True,
-                "variables": node_data.get('variables', {}),
-                "status": "killed" if node_data.get('killed') else ("error" if node_data.get('error') else "success")
-            }
-            mock_nodes.append(mock_node)
+        mock_nodes = [_to_mock_node(node, run_id) for node in nodes]
 
         # Include stage information in the response so frontend can build correct links
         return {
@@ -125,6 +161,7 @@ def clear_all_runs(
 ):
     try:
         storage.clear_all_runs(flow_id)
+        forget_node_results(flow_id)
         return {"message": "All runs cleared successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
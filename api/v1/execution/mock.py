@@ -1,9 +1,10 @@
 import asyncio
 import inspect
-import os
+import random
 import time
 import traceback
 import uuid
+from functools import lru_cache
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from starlette.responses import JSONResponse
@@ -17,9 +18,11 @@ from models import Project, NodeSetupVersion
 from services.mock_sync_service import MockSyncService, get_mock_sync_service
 from repositories.node_setup_repository import get_node_setup_repository, NodeSetupRepository
 from services.active_listeners_service import get_active_listeners_service
-from services.lambda_service import get_lambda_service, LambdaService
+from services.lambda_service import get_lambda_service, LambdaService, lambda_executor
 from services.local_log_service import LogCapture
 from utils.get_current_account import get_project_or_403
+from utils.node_environment import set_node_environment_defaults, set_node_project
+from utils.node_setup_code import load_node_setup_namespace
 from core.settings import settings
 from core.logging_config import get_logger
 
@@ -28,6 +31,21 @@ logger = get_logger(__name__)
 
 MAX_RETRIES = 5
 INITIAL_DELAY = 2
+MAX_DELAY = 10
+
+@lru_cache(maxsize=1024)
+def _mock_lambda_target(version_id: uuid.UUID, project_id: uuid.UUID, tenant_id: uuid.UUID) -> tuple[str, str]:
+    # Function name and S3 key of a version's mock Lambda, both fixed for the
+    # lifetime of the version
+    function_name = f"node_setup_{version_id}_mock"
+    return function_name, f"{tenant_id}/{project_id}/{function_name}.py"
+
+
+def _set_local_environment(project: Project) -> None:
+    # Shared by the blocking and background local runs
+    set_node_project(project.id, project.tenant_id)
+    set_node_environment_defaults()
+
 
 @router.get("/{version_id}/{mock_node_id}/", response_model=None)
 async def mock_play(
@@ -40,59 +58,62 @@ async def mock_play(
     node_setup_repository: NodeSetupRepository = Depends(get_node_setup_repository),
     mock_sync_service: MockSyncService = Depends(get_mock_sync_service)
 ):
+    version_id_str = str(version_id)
+
     # Log execution context
     logger.info_ctx("Mock execution starting",
-        version_id=str(version_id),
+        version_id=version_id_str,
         node_id=str(mock_node_id),
         project_id=str(project.id),
         sub_stage=sub_stage,
         execution_mode="local" if settings.EXECUTE_NODE_SETUP_LOCAL else "lambda"
     )
 
-    active_listener_service.set_listener(str(version_id))
+    active_listener_service.set_listener(version_id_str)
     version = node_setup_repository.get_or_404(version_id)
 
     if settings.EXECUTE_NODE_SETUP_LOCAL:
         logger.debug("Executing locally")
         return await execute_local(project, version, mock_node_id, sub_stage, active_listener_service)
 
-    function_name = f"node_setup_{version_id}_mock"
+    function_name, s3_key = _mock_lambda_target(version_id, project.id, project.tenant_id)
     mock_sync_service.sync_if_needed(version, project)
     payload = {
         "node_id": str(mock_node_id),
-        "s3_key": f"{project.tenant_id}/{project.id}/{function_name}.py",
+        "s3_key": s3_key,
         "mock": True,
         "sub_stage": sub_stage,
     }
 
     logger.info_ctx("Invoking Lambda function",
         function_name=function_name,
-        payload_size=len(str(payload))
+        payload_keys=len(payload)
     )
 
-    delay = INITIAL_DELAY
+    loop = asyncio.get_running_loop()
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, lambda_service.invoke_lambda, function_name, payload)
+            response = await loop.run_in_executor(lambda_executor, lambda_service.invoke_lambda, function_name, payload)
             logger.info_ctx("Lambda execution successful",
-                version_id=str(version_id),
+                version_id=version_id_str,
                 attempts=attempt
             )
             return {"status": "mock executed", "result": response}
         except Exception as e:
             msg = str(e)
             if "ResourceConflictException" in msg and "Pending" in msg:
-                logger.warning_ctx(f"Lambda pending, retry {attempt}/{MAX_RETRIES} in {delay}s",
-                    version_id=str(version_id),
+                # Capped exponential backoff with full jitter, so concurrent
+                # runs against the same pending Lambda don't retry in lockstep
+                delay = random.uniform(0, min(MAX_DELAY, INITIAL_DELAY * 2 ** (attempt - 1)))
+                logger.warning_ctx(f"Lambda pending, retry {attempt}/{MAX_RETRIES} in {delay:.1f}s",
+                    version_id=version_id_str,
                     retry_attempt=attempt,
                     delay_seconds=delay
                 )
-                time.sleep(delay)
-                delay *= 2
+                await asyncio.sleep(delay)
             else:
                 logger.error_ctx("Lambda execution failed",
-                    version_id=str(version_id),
+                    version_id=version_id_str,
                     error_type=type(e).__name__,
                     error_message=msg,
                     attempts=attempt
@@ -100,7 +121,7 @@ async def mock_play(
                 raise HTTPException(status_code=500, detail={"error": "Lambda error", "details": msg})
 
     logger.error_ctx("Lambda stuck in pending status after max retries",
-        version_id=str(version_id),
+        version_id=version_id_str,
         max_retries=MAX_RETRIES
     )
     raise HTTPException(status_code=503, detail="Lambda remained in pending status")
@@ -114,28 +135,20 @@ async def execute_local(
     active_listener_service: ActiveListenersService,
     input_data: dict = None
 ) -> JSONResponse:
-    os.environ['PROJECT_ID'] = str(project.id)
-    os.environ['TENANT_ID'] = str(project.tenant_id)
-    os.environ.setdefault("AWS_REGION", settings.AWS_REGION)
-    os.environ.setdefault("AWS_ACCESS_KEY_ID", settings.AWS_ACCESS_KEY_ID)
-    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", settings.AWS_SECRET_ACCESS_KEY)
-
-    # Set database URLs for section nodes
-    # Strip psycopg2 dialect for nodes (they use sqlalchemy with psycopg2-binary)
-    database_url = settings.DATABASE_URL.replace("postgresql+psycopg2://", "postgresql://")
-    os.environ.setdefault("DATABASE_URL", database_url)
-    os.environ.setdefault("SECTIONS_DATABASE_URL", settings.SECTIONS_DATABASE_URL)
+    flow_id = str(version.id)
+    _set_local_environment(project)
 
     code = version.executable
-    namespace = {}
+    # One id per run: it tags the START/END log lines and is passed to the runner
+    run_id = str(uuid.uuid4())
     
     # Use LogCapture to capture all stdout/stderr during local execution
-    with LogCapture(str(version.id), "mock") as log_capture:
-        log_capture.add_custom_log(f"START RequestId: local-{uuid.uuid4()} Version: {version.id}")
+    with LogCapture(flow_id, "mock") as log_capture:
+        log_capture.add_custom_log(f"START RequestId: local-{run_id} Version: {flow_id}")
         
         try:
             log_capture.add_custom_log("Loading and executing node setup code...")
-            exec(code, namespace)
+            namespace = await asyncio.to_thread(load_node_setup_namespace, code, {})
         except Exception:
             error_details = traceback.format_exc()
             log_capture.add_custom_log(f"[ERROR] Failed to execute code: {error_details}")
@@ -151,7 +164,6 @@ async def execute_local(
             return JSONResponse({"error": error_msg}, status_code=400)
 
         try:
-            run_id = str(uuid.uuid4())
             log_capture.add_custom_log(f"Starting execution with run_id: {run_id}, mock_node_id: {mock_node_id}, sub_stage: {sub_stage}")
 
             import sys as _sys
@@ -162,12 +174,12 @@ async def execute_local(
                 current_session_id.set(input_data['session_id'])
                 _real_print(f"[EXEC_LOCAL] Set current_session_id to: {input_data['session_id']}")
 
-            _real_print(f"[EXEC_LOCAL] Checking has_listener for version_id={version.id}")
-            has_listener = active_listener_service.has_listener(str(version.id), first_run=True)
+            _real_print(f"[EXEC_LOCAL] Checking has_listener for version_id={flow_id}")
+            has_listener = active_listener_service.has_listener(flow_id, first_run=True)
             print(f"[EXEC_LOCAL] has_listener result: {has_listener}")
             if has_listener:
-                print(f"[EXEC_LOCAL] Sending run_start event for flow_id={version.id}, run_id={run_id}")
-                send_flow_event(str(version.id), run_id, None, "run_start")
+                print(f"[EXEC_LOCAL] Sending run_start event for flow_id={flow_id}, run_id={run_id}")
+                send_flow_event(flow_id, run_id, None, "run_start")
                 log_capture.add_custom_log("Sent run_start event via WebSocket")
                 print(f"[EXEC_LOCAL] run_start event sent")
 
@@ -179,15 +191,17 @@ async def execute_local(
             else:
                 log_capture.add_custom_log("Executing sync function...")
                 print(f"[EXEC_LOCAL] Calling sync fn with input_data keys: {list(input_data.keys()) if input_data else 'None'}")
-                result = fn(mock_node_id, run_id, sub_stage, input_data)
+                result = await asyncio.to_thread(fn, mock_node_id, run_id, sub_stage, input_data)
                 
-            log_capture.add_custom_log(f"Function execution completed successfully. Result keys: {list(result.keys()) if isinstance(result, dict) else 'non-dict result'}")
+            log_capture.add_custom_log(f"Function execution completed successfully. Result keys: {list(result) if isinstance(result, dict) else 'non-dict result'}")
             
-            has_listener_end = active_listener_service.has_listener(str(version.id))
+            # A listener seen at run_start is still the target for run_end; only
+            # look it up again if there was none when the run started
+            has_listener_end = has_listener or active_listener_service.has_listener(flow_id)
             print(f"[EXEC_LOCAL] has_listener for run_end: {has_listener_end}")
             if has_listener_end:
                 print(f"[EXEC_LOCAL] Sending run_end event")
-                send_flow_event(str(version.id), run_id, None, "run_end")
+                send_flow_event(flow_id, run_id, None, "run_end")
                 log_capture.add_custom_log("Sent run_end event via WebSocket")
                 print(f"[EXEC_LOCAL] run_end event sent")
 
@@ -266,12 +280,8 @@ async def execute_local_background(
 ):
     """Background execution that doesn't block the API response"""
     try:
-        # Same setup as execute_local but runs in background
-        os.environ['PROJECT_ID'] = str(project.id)
-        os.environ['TENANT_ID'] = str(project.tenant_id)
-        os.environ.setdefault("AWS_REGION", settings.AWS_REGION)
-        os.environ.setdefault("AWS_ACCESS_KEY_ID", settings.AWS_ACCESS_KEY_ID)
-        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", settings.AWS_SECRET_ACCESS_KEY)
+        flow_id = str(version.id)
+        _set_local_environment(project)
 
         code = version.executable
         namespace = {
@@ -279,12 +289,12 @@ async def execute_local_background(
             "__builtins__": __builtins__,
         }
 
-        with LogCapture(str(version.id), "mock") as log_capture:
-            log_capture.add_custom_log(f"BACKGROUND START RequestId: {run_id} Version: {version.id}")
+        with LogCapture(flow_id, "mock") as log_capture:
+            log_capture.add_custom_log(f"BACKGROUND START RequestId: {run_id} Version: {flow_id}")
             
             try:
                 log_capture.add_custom_log("Loading and executing node setup code (background)...")
-                exec(code, namespace)
+                await asyncio.to_thread(load_node_setup_namespace, code, namespace)
             except Exception:
                 error_details = traceback.format_exc()
                 log_capture.add_custom_log(f"[ERROR] Failed to execute code: {error_details}")
@@ -299,8 +309,9 @@ async def execute_local_background(
             try:
                 log_capture.add_custom_log(f"Starting background execution with run_id: {run_id}, mock_node_id: {mock_node_id}, sub_stage: {sub_stage}")
                 
-                if active_listener_service.has_listener(str(version.id), first_run=True):
-                    send_flow_event(str(version.id), run_id, None, "run_start")
+                has_listener = active_listener_service.has_listener(flow_id, first_run=True)
+                if has_listener:
+                    send_flow_event(flow_id, run_id, None, "run_start")
                     log_capture.add_custom_log("Sent run_start event via WebSocket")
                 
                 # Execute the function - this can take a long time but doesn't block API
@@ -309,12 +320,12 @@ async def execute_local_background(
                     result = await fn(mock_node_id, run_id, sub_stage)
                 else:
                     log_capture.add_custom_log("Executing sync function (background)...")
-                    result = fn(mock_node_id, run_id, sub_stage)
+                    result = await asyncio.to_thread(fn, mock_node_id, run_id, sub_stage)
                     
-                log_capture.add_custom_log(f"Background execution completed successfully. Result keys: {list(result.keys()) if isinstance(result, dict) else 'non-dict result'}")
+                log_capture.add_custom_log(f"Background execution completed successfully. Result keys: {list(result) if isinstance(result, dict) else 'non-dict result'}")
                 
-                if active_listener_service.has_listener(str(version.id)):
-                    send_flow_event(str(version.id), run_id, None, "run_end")
+                if has_listener or active_listener_service.has_listener(flow_id):
+                    send_flow_event(flow_id, run_id, None, "run_end")
                     log_capture.add_custom_log("Sent run_end event via WebSocket")
 
                 log_capture.add_custom_log(f"BACKGROUND END RequestId: {run_id}")
@@ -339,11 +350,11 @@ async def execute_lambda_background(
 ):
     """Background Lambda execution"""
     try:
-        function_name = f"node_setup_{version.id}_mock"
+        function_name, s3_key = _mock_lambda_target(version.id, project.id, project.tenant_id)
         mock_sync_service.sync_if_needed(version, project)
         payload = {
             "node_id": str(mock_node_id),
-            "s3_key": f"{project.tenant_id}/{project.id}/{function_name}.py",
+            "s3_key": s3_key,
             "mock": True,
             "sub_stage": sub_stage,
             "run_id": run_id  # Pass run_id to Lambda
@@ -352,24 +363,10 @@ async def execute_lambda_background(
         # Note: Lambda will send run_start and run_end events itself
         # No need to send from API to avoid duplicates
         
-        delay = INITIAL_DELAY
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(None, lambda_service.invoke_lambda, function_name, payload)
-                logger.info(f"Background Lambda execution completed for run_id: {run_id}")
-                return response
-            except Exception as e:
-                msg = str(e)
-                if "ResourceConflictException" in msg and "Pending" in msg:
-                    logger.warning(f"Lambda pending, retry {attempt}/{MAX_RETRIES} in {delay}s")
-                    await asyncio.sleep(delay)  # Use async sleep in background
-                    delay *= 2
-                else:
-                    logger.error(f"Background Lambda exec error: {msg}")
-                    return
-        
-        logger.error(f"Background Lambda remained in pending status for run_id: {run_id}")
-        
+        # Fire-and-forget: Lambda queues the event and handles retries itself
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(lambda_executor, lambda_service.invoke_lambda_event, function_name, payload)
+        logger.info(f"Background Lambda execution queued for run_id: {run_id}")
+
     except Exception as e:
         logger.error(f"Background Lambda execution error: {str(e)}")
\ No newline at end of file
@@ -1,6 +1,5 @@
 import asyncio
 import inspect
-import os
 import traceback
 import uuid
 
@@ -10,14 +9,17 @@ from sqlalchemy.orm import Session
 from starlette.responses import JSONResponse
 
 from models import Project, NodeSetupVersion
+from api.v1.execution.details import forget_node_results
 from repositories.node_setup_repository import get_node_setup_repository, NodeSetupRepository
-from services.lambda_service import get_lambda_service, LambdaService
+from services.lambda_service import get_lambda_service, LambdaService, lambda_executor
 from services.local_log_service import LogCapture
 from services.active_listeners_service import get_active_listeners_service
 from polysynergy_node_runner.services.active_listeners_service import ActiveListenersService
 from db.session import get_db
 from core.settings import settings
 from core.logging_config import get_logger
+from utils.node_environment import set_node_environment_defaults, set_node_project
+from utils.node_setup_code import load_node_setup_namespace
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -29,6 +31,20 @@ class ResumeRequest(BaseModel):
     user_input: dict | bool  # Accept both dict and bool for different pause types
 
 
+def _load_version_and_project(
+    db: Session,
+    node_setup_repository: NodeSetupRepository,
+    version_id: uuid.UUID
+) -> tuple[NodeSetupVersion, Project | None]:
+    # Blocking DB work, run through asyncio.to_thread by resume_flow
+    version = node_setup_repository.get_or_404(version_id)
+
+    # Get project via version.node_setup relationship
+    parent = version.node_setup.resolve_parent(db)
+    project = parent.project if hasattr(parent, 'project') else None
+    return version, project
+
+
 @router.post("/{version_id}/resume/", response_model=None)
 async def resume_flow(
     version_id: uuid.UUID,
@@ -51,32 +67,42 @@ async def resume_flow(
     Returns:
         JSONResponse with execution result
     """
+    version_id_str = str(version_id)
+
     # Set up the listener for WebSocket events
-    active_listener_service.set_listener(str(version_id))
+    active_listener_service.set_listener(version_id_str)
 
-    version = node_setup_repository.get_or_404(version_id)
+    version, project = await asyncio.to_thread(_load_version_and_project, db, node_setup_repository, version_id)
 
-    # Get project via version.node_setup relationship
-    parent = version.node_setup.resolve_parent(db)
-    project = parent.project if hasattr(parent, 'project') else None
+    # String forms reused by the log line, the s3 key and the node environment
+    project_id_str = str(project.id) if project else None
+    tenant_id_str = str(project.tenant_id) if project else None
 
     logger.info_ctx("HIL Resume execution starting",
-        version_id=str(version_id),
+        version_id=version_id_str,
         run_id=resume_request.run_id,
         resume_node_id=resume_request.resume_node_id,
-        project_id=str(project.id) if project else "unknown",
+        project_id=project_id_str or "unknown",
         execution_mode="local" if settings.EXECUTE_NODE_SETUP_LOCAL else "lambda"
     )
 
+    # The resumed run rewrites node results under the same run_id. Drop cached
+    # results now, and again when it is done in case one was read mid-run.
+    forget_node_results(version_id_str, resume_request.run_id)
+
     if settings.EXECUTE_NODE_SETUP_LOCAL:
         logger.debug("Executing resume locally")
-        return await execute_resume_local(
-            version,
-            resume_request.run_id,
-            resume_request.resume_node_id,
-            resume_request.user_input,
-            project
-        )
+        try:
+            return await execute_resume_local(
+                version,
+                resume_request.run_id,
+                resume_request.resume_node_id,
+                resume_request.user_input,
+                project_id_str,
+                tenant_id_str
+            )
+        finally:
+            forget_node_results(version_id_str, resume_request.run_id)
 
     # Lambda execution
     function_name = f"node_setup_{version_id}_mock"
@@ -84,7 +110,7 @@ async def resume_flow(
     # Build s3_key with project info if available
     s3_key = f"{function_name}.py"
     if project:
-        s3_key = f"{project.tenant_id}/{project.id}/{function_name}.py"
+        s3_key = f"{tenant_id_str}/{project_id_str}/{function_name}.py"
 
     payload = {
         "resume": True,
@@ -100,22 +126,24 @@ async def resume_flow(
     )
 
     try:
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, lambda_service.invoke_lambda, function_name, payload)
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(lambda_executor, lambda_service.invoke_lambda, function_name, payload)
         logger.info_ctx("Lambda resume execution successful",
-            version_id=str(version_id),
+            version_id=version_id_str,
             run_id=resume_request.run_id
         )
         return {"status": "resumed", "result": response}
     except Exception as e:
         msg = str(e)
         logger.error_ctx("Lambda resume execution failed",
-            version_id=str(version_id),
+            version_id=version_id_str,
             run_id=resume_request.run_id,
             error_type=type(e).__name__,
             error_message=msg
         )
         raise HTTPException(status_code=500, detail={"error": "Lambda resume error", "details": msg})
+    finally:
+        forget_node_results(version_id_str, resume_request.run_id)
 
 
 async def execute_resume_local(
@@ -123,34 +151,28 @@ async def execute_resume_local(
     run_id: str,
     resume_node_id: str,
     user_input: dict,
-    project: Project | None = None
+    project_id: str | None = None,
+    tenant_id: str | None = None
 ) -> JSONResponse:
     """Execute resume locally (for development/testing)"""
     # Set environment variables if project is available
-    if project:
-        os.environ['PROJECT_ID'] = str(project.id)
-        os.environ['TENANT_ID'] = str(project.tenant_id)
+    if project_id:
+        set_node_project(project_id, tenant_id)
 
-    os.environ.setdefault("AWS_REGION", settings.AWS_REGION)
-    os.environ.setdefault("AWS_ACCESS_KEY_ID", settings.AWS_ACCESS_KEY_ID)
-    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", settings.AWS_SECRET_ACCESS_KEY)
-
-    # Set database URLs for section nodes
-    # Strip psycopg2 dialect for nodes (they use sqlalchemy with psycopg2-binary)
-    database_url = settings.DATABASE_URL.replace("postgresql+psycopg2://", "postgresql://")
-    os.environ.setdefault("DATABASE_URL", database_url)
-    os.environ.setdefault("SECTIONS_DATABASE_URL", settings.SECTIONS_DATABASE_URL)
+    set_node_environment_defaults()
 
     code = version.executable
     namespace = {}
 
+    version_id_str = str(version.id)
+
     # Use LogCapture to capture all stdout/stderr during local execution
-    with LogCapture(str(version.id), "resume") as log_capture:
-        log_capture.add_custom_log(f"RESUME START RequestId: {run_id} Version: {version.id}")
+    with LogCapture(version_id_str, "resume") as log_capture:
+        log_capture.add_custom_log(f"RESUME START RequestId: {run_id} Version: {version_id_str}")
 
         try:
             log_capture.add_custom_log("Loading and executing node setup code for resume...")
-            exec(code, namespace)
+            await asyncio.to_thread(load_node_setup_namespace, code, namespace)
         except Exception:
             error_details = traceback.format_exc()
             log_capture.add_custom_log(f"[ERROR] Failed to execute code: {error_details}")
@@ -181,7 +203,7 @@ async def execute_resume_local(
 
             log_capture.add_custom_log(
                 f"Resume execution completed successfully. "
-                f"Result keys: {list(result.keys()) if isinstance(result, dict) else 'non-dict result'}"
+                f"Result keys: {list(result) if isinstance(result, dict) else 'non-dict result'}"
             )
 
             log_capture.add_custom_log(f"RESUME END RequestId: {run_id}")
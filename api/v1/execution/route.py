@@ -2,31 +2,39 @@
 Route execution endpoint for self-hosted mode.
 Handles execution requests from the router service.
 """
+import asyncio
 import uuid
-import os
 import json
 import inspect
 import traceback
 from typing import Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import Response
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
 
 from models import Project, NodeSetupVersion
 from db.session import get_db
-from repositories.node_setup_repository import get_node_setup_repository, NodeSetupRepository
+from repositories.node_setup_repository import NodeSetupRepository
 from services.active_listeners_service import get_active_listeners_service
 from polysynergy_node_runner.services.active_listeners_service import ActiveListenersService
 from polysynergy_node_runner.execution_context.send_flow_event import send_flow_event
 from services.local_log_service import LogCapture
-from core.settings import settings
 from core.logging_config import get_logger
+from utils.node_environment import set_node_environment_defaults, set_node_project
+from utils.node_setup_code import load_node_setup_namespace
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Fixed JSON bodies, encoded once
+_ENTRY_POINT_NOT_FOUND_BODY = json.dumps({"error": "Function 'execute_with_production_start' not found"}).encode()
+_SCHEDULE_EXECUTED_BODY = json.dumps({"message": "Schedule executed successfully"}).encode()
+_NO_HTTP_RESPONSE_BODY = json.dumps({"error": "No valid HttpResponse node found"}).encode()
+
 
 class RouteExecutionRequest(BaseModel):
     """Request payload from router for route execution."""
@@ -42,11 +50,48 @@ class RouteExecutionRequest(BaseModel):
     body: Any | None = None
 
 
-@router.post("/")
-async def execute_route(
+async def _parse_route_request(http_request: Request) -> RouteExecutionRequest:
+    # Validate the raw bytes with pydantic-core's JSON parser instead of
+    # json.loads followed by validating the resulting dicts
+    try:
+        return RouteExecutionRequest.model_validate_json(await http_request.body())
+    except ValidationError as e:
+        # Same error locations FastAPI reports for a declared body parameter
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)
+        ])
+
+
+def _load_version_and_check_project(
+    db: Session,
     request: RouteExecutionRequest,
+    project_uuid: uuid.UUID,
+    tenant_uuid: uuid.UUID
+) -> tuple[NodeSetupVersion, bool]:
+    # Blocking DB work, run through asyncio.to_thread by execute_route
+
+    # Fetch NodeSetupVersion
+    version_uuid = uuid.UUID(request.node_setup_version_id)
+    version = NodeSetupRepository(db).get_or_404(version_uuid)
+
+    # Only the ids are used downstream and both come from the request,
+    # so an existence check is enough; no Project row is loaded
+    project_exists = db.scalar(select(exists().where(
+        Project.id == project_uuid,
+        Project.tenant_id == tenant_uuid
+    )))
+    return version, project_exists
+
+
+@router.post("/", openapi_extra={
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": RouteExecutionRequest.model_json_schema()}}
+    }
+})
+async def execute_route(
+    request: RouteExecutionRequest = Depends(_parse_route_request),
     db: Session = Depends(get_db),
-    node_setup_repository: NodeSetupRepository = Depends(get_node_setup_repository),
     active_listener_service: ActiveListenersService = Depends(get_active_listeners_service)
 ):
     """
@@ -62,19 +107,13 @@ async def execute_route(
     )
 
     try:
-        # Fetch NodeSetupVersion
-        version_uuid = uuid.UUID(request.node_setup_version_id)
-        version = node_setup_repository.get_or_404(version_uuid)
-
-        # Fetch Project
         project_uuid = uuid.UUID(request.project_id)
         tenant_uuid = uuid.UUID(request.tenant_id)
-        project = db.query(Project).filter(
-            Project.id == project_uuid,
-            Project.tenant_id == tenant_uuid
-        ).first()
+        version, project_exists = await asyncio.to_thread(
+            _load_version_and_check_project, db, request, project_uuid, tenant_uuid
+        )
 
-        if not project:
+        if not project_exists:
             logger.error_ctx("Project not found",
                 project_id=request.project_id,
                 tenant_id=request.tenant_id
@@ -82,7 +121,7 @@ async def execute_route(
             raise HTTPException(status_code=404, detail="Project not found")
 
         # Execute the route
-        return await execute_route_local(request, version, project, active_listener_service)
+        return await execute_route_local(request, version, project_uuid, tenant_uuid, active_listener_service)
 
     except ValueError as e:
         logger.error_ctx("Invalid UUID",
@@ -103,32 +142,29 @@ async def execute_route(
 async def execute_route_local(
     request: RouteExecutionRequest,
     version: NodeSetupVersion,
-    project: Project,
+    project_id: uuid.UUID,
+    tenant_id: uuid.UUID,
     active_listener_service: ActiveListenersService
 ) -> Response:
     """Execute a route in local/self-hosted mode."""
 
     # Set environment variables (same as mock execution)
-    os.environ['PROJECT_ID'] = str(project.id)
-    os.environ['TENANT_ID'] = str(project.tenant_id)
-    os.environ.setdefault("AWS_REGION", settings.AWS_REGION)
-    os.environ.setdefault("AWS_ACCESS_KEY_ID", settings.AWS_ACCESS_KEY_ID)
-    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", settings.AWS_SECRET_ACCESS_KEY)
-
-    database_url = settings.DATABASE_URL.replace("postgresql+psycopg2://", "postgresql://")
-    os.environ.setdefault("DATABASE_URL", database_url)
-    os.environ.setdefault("SECTIONS_DATABASE_URL", settings.SECTIONS_DATABASE_URL)
+    set_node_project(project_id, tenant_id)
+    set_node_environment_defaults()
 
     # Load executable code
     code = version.executable
     namespace = {}
+    # One id per run: it tags the START/END log lines and is passed to the runner
+    run_id = str(uuid.uuid4())
+    version_id_str = str(version.id)
 
-    with LogCapture(str(version.id), request.stage) as log_capture:
-        log_capture.add_custom_log(f"START RequestId: local-{uuid.uuid4()} Version: {version.id}")
+    with LogCapture(version_id_str, request.stage) as log_capture:
+        log_capture.add_custom_log(f"START RequestId: local-{run_id} Version: {version_id_str}")
 
         try:
             log_capture.add_custom_log("Loading node setup code for route execution...")
-            exec(code, namespace)
+            await asyncio.to_thread(load_node_setup_namespace, code, namespace)
         except Exception:
             error_details = traceback.format_exc()
             log_capture.add_custom_log(f"[ERROR] Failed to execute code: {error_details}")
@@ -144,13 +180,12 @@ async def execute_route_local(
             error_msg = "Function 'execute_with_production_start' not found"
             log_capture.add_custom_log(f"[ERROR] {error_msg}")
             return Response(
-                content=json.dumps({"error": error_msg}),
+                content=_ENTRY_POINT_NOT_FOUND_BODY,
                 status_code=500,
                 media_type="application/json"
             )
 
         try:
-            run_id = str(uuid.uuid4())
             log_capture.add_custom_log(f"Starting route execution: run_id={run_id}, method={request.method}, path={request.path}")
 
             # Transform router payload to Lambda event format
@@ -165,8 +200,9 @@ async def execute_route_local(
 
             # Check for active listeners and send events (for test/mock stages)
             is_test_run = request.stage in ["mock", "test"]
-            if is_test_run and active_listener_service.has_listener(str(version.id), required_stage=request.stage, first_run=True):
-                send_flow_event(str(version.id), run_id, None, "run_start")
+            has_listener = is_test_run and active_listener_service.has_listener(version_id_str, required_stage=request.stage, first_run=True)
+            if has_listener:
+                send_flow_event(version_id_str, run_id, None, "run_start")
 
             # Execute the function
             if inspect.iscoroutinefunction(fn):
@@ -174,9 +210,9 @@ async def execute_route_local(
             else:
                 execution_flow, flow, state, is_schedule = fn(event, run_id, request.stage)
 
-            # Send end event
-            if is_test_run and active_listener_service.has_listener(str(version.id), required_stage=request.stage):
-                send_flow_event(str(version.id), run_id, None, "run_end")
+            # Send end event; a listener seen at run_start needs no second lookup
+            if has_listener or (is_test_run and active_listener_service.has_listener(version_id_str, required_stage=request.stage)):
+                send_flow_event(version_id_str, run_id, None, "run_end")
 
             # Find HttpResponse node and extract response
             last_http_response = next(
@@ -215,14 +251,14 @@ async def execute_route_local(
             if is_schedule:
                 log_capture.add_custom_log("Schedule execution completed (no HttpResponse needed)")
                 return Response(
-                    content=json.dumps({"message": "Schedule executed successfully"}),
+                    content=_SCHEDULE_EXECUTED_BODY,
                     status_code=200,
                     media_type="application/json"
                 )
             else:
                 log_capture.add_custom_log("[ERROR] No HttpResponse node found in route flow")
                 return Response(
-                    content=json.dumps({"error": "No valid HttpResponse node found"}),
+                    content=_NO_HTTP_RESPONSE_BODY,
                     status_code=500,
                     media_type="application/json"
                 )
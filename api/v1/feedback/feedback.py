@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends
 from models import Account
 from schemas.feedback import FeedbackCreate, FeedbackResponse
 from services.email.email_service import EmailService
@@ -12,30 +12,30 @@ logger = get_logger(__name__)
 @router.post("/", response_model=FeedbackResponse)
 async def submit_feedback(
     feedback: FeedbackCreate,
-    background_tasks: BackgroundTasks,
     account: Account = Depends(get_current_account),
 ):
     """
     Submit user feedback that will be emailed to the admin.
     Requires authentication.
     """
+    account_id_str = str(account.id)
+
     try:
         # Format timestamp for email
         timestamp_str = feedback.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")
 
-        # Send feedback email in background
+        # Queue the feedback email for the email worker
         EmailService.send_feedback_email(
             user_email=feedback.email,
             message=feedback.message,
             timestamp=timestamp_str,
-            user_agent=feedback.user_agent,
-            background_tasks=background_tasks
+            user_agent=feedback.user_agent
         )
 
         logger.info(
-            f"Feedback submitted by {account.email} ({account.id})",
+            "Feedback submitted by %s (%s)", account.email, account_id_str,
             extra={
-                "account_id": str(account.id),
+                "account_id": account_id_str,
                 "feedback_email": feedback.email,
                 "message_length": len(feedback.message)
             }
@@ -48,9 +48,9 @@ async def submit_feedback(
 
     except Exception as e:
         logger.error(
-            f"Failed to submit feedback: {str(e)}",
+            "Failed to submit feedback: %s", e,
             extra={
-                "account_id": str(account.id),
+                "account_id": account_id_str,
                 "error": str(e)
             }
         )
@@ -1,23 +1,47 @@
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+import hashlib
+import json
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
 
 from services.gather_nodes_service import discover_nodes
 from core.settings import settings
 
 router = APIRouter()
 
+# Encoded, filtered node list and its ETag, rebuilt only when discover_nodes()
+# returns a different list (it memoizes its result for the life of the process)
+_nodes_cache: dict = {"source": None, "json": b"", "etag": ""}
+
+
+def _filtered_nodes(nodes: list) -> list:
+    # Filter out nodes with deployment.local metadata when not running locally
+    if settings.EXECUTE_NODE_SETUP_LOCAL:
+        return nodes
+    return [
+        node for node in nodes
+        if node.get("metadata", {}).get("deployment") != "local"
+    ]
+
+
 @router.get("/")
-def list_nodes():
+def list_nodes(request: Request):
     try:
         nodes = discover_nodes()  # Will use settings.NODE_PACKAGES
 
-        # Filter out nodes with deployment.local metadata when not running locally
-        if not settings.EXECUTE_NODE_SETUP_LOCAL:
-            nodes = [
-                node for node in nodes
-                if node.get("metadata", {}).get("deployment") != "local"
-            ]
+        if _nodes_cache["source"] is not nodes:
+            body = json.dumps(
+                _filtered_nodes(nodes),
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":")
+            ).encode("utf-8")
+            digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+            _nodes_cache.update(source=nodes, json=body, etag=f'"{digest}"')
 
-        return JSONResponse(content=nodes)
+        headers = {"ETag": _nodes_cache["etag"], "Cache-Control": "max-age=60"}
+        if request.headers.get("if-none-match") == _nodes_cache["etag"]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=_nodes_cache["json"], media_type="application/json", headers=headers)
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
\ No newline at end of file
+        return JSONResponse(status_code=500, content={"error": str(e)})
@@ -1,23 +1,80 @@
 from fastapi import APIRouter, HTTPException, Query, Request, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
 from repositories.node_setup_repository import NodeSetupRepository, get_node_setup_repository
-from typing import Optional
+from typing import Callable, Optional
+import asyncio
 import boto3
+import httpx
+from cachetools import TTLCache
+from botocore.config import Config
+import html
 import os
+import re
 import json
 import time
 import logging
-import sys
+import threading
+from functools import lru_cache
 
-# Add node_runner to path for imports
-sys.path.append('/Users/dionsnoeijen/polysynergy/orchestrator/node_runner')
+from polysynergy_node_runner.services.secrets_manager import get_secrets_manager
+from polysynergy_node_runner.services.env_var_manager import get_env_var_manager
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-def resolve_variable(value: str, version_uuid, node_setup_repository) -> str:
+# <secret:keyname> resolves from AWS Secrets Manager, <environment:keyname>
+# from the DynamoDB environment variables
+_PLACEHOLDER_RE = re.compile(r"<(secret|environment):(.+)>")
+_PLACEHOLDER_LABELS = {"secret": "secret", "environment": "environment variable"}
+
+# Resolved placeholder values, keyed by (kind, key, project_id, stage). Only
+# values that were found are cached, so a newly added secret or variable is
+# picked up on the next request; changed values are picked up within a minute.
+_resolved_values = TTLCache(maxsize=1024, ttl=60)
+_resolved_values_lock = threading.Lock()
+
+
+def _cached_lookup(cache_key: tuple, fetch: Callable[[], Optional[str]]) -> Optional[str]:
+    with _resolved_values_lock:
+        if cache_key in _resolved_values:
+            return _resolved_values[cache_key]
+
+    value = fetch()
+    if value:
+        with _resolved_values_lock:
+            _resolved_values[cache_key] = value
+    return value
+
+
+@lru_cache(maxsize=1)
+def _secrets_manager():
+    # Each factory call constructs a new manager; one per process is enough
+    return get_secrets_manager()
+
+
+@lru_cache(maxsize=1)
+def _env_var_manager():
+    return get_env_var_manager()
+
+
+def _fetch_secret(secret_key: str, project_id: str, stage: str) -> Optional[str]:
+    def fetch():
+        secret = _secrets_manager().get_secret_by_key(secret_key, project_id, stage)
+        return secret.get("value") if secret else None
+
+    return _cached_lookup(("secret", secret_key, project_id, stage), fetch)
+
+
+def _fetch_env(env_key: str, project_id: str, stage: str) -> Optional[str]:
+    def fetch():
+        return _env_var_manager().get_var(project_id, stage, env_key)
+
+    return _cached_lookup(("environment", env_key, project_id, stage), fetch)
+
+
+def resolve_variable(value: str, project_id: Optional[str]) -> str:
     """
     Resolve secret and environment variable placeholders in a value.
 
@@ -26,89 +83,63 @@ def resolve_variable(value: str, version_uuid, node_setup_repository) -> str:
     - <environment:keyname> - Resolves from DynamoDB environment variables
     - Plain strings - Returns as-is (1-op-1)
 
+    project_id is resolved once by the caller, which already has the version.
+
     Returns the resolved value or original if not a placeholder.
     """
     if not isinstance(value, str):
         return value
 
-    # Only resolve if it's exactly the secret placeholder format
-    if value.startswith("<secret:") and value.endswith(">"):
-        secret_key = value[8:-1]  # Extract key from <secret:keyname>
-        logger.info(f"Resolving secret: {secret_key}")
+    # Not a placeholder, return the original value as-is (1-op-1)
+    match = _PLACEHOLDER_RE.fullmatch(value)
+    if not match:
+        return value
 
-        try:
-            # Get project_id from environment or version metadata
-            project_id = os.getenv("PROJECT_ID")
-            if not project_id:
-                # Try to get from node setup version
-                version = node_setup_repository.get_or_404(version_uuid)
-                project_id = str(version.project_id) if hasattr(version, 'project_id') else None
-
-            if not project_id:
-                logger.error("PROJECT_ID not found for secret resolution")
-                return value
-
-            # Use SecretsManager to resolve
-            from polysynergy_node_runner.services.secrets_manager import get_secrets_manager
-            secrets_manager = get_secrets_manager()
-            stage = os.getenv("STAGE", "mock")
-
-            secret = secrets_manager.get_secret_by_key(secret_key, project_id, stage)
-            if secret and secret.get("value"):
-                logger.info(f"Secret {secret_key} resolved successfully")
-                return secret["value"]
-            else:
-                logger.warning(f"Secret {secret_key} not found")
-                return value
+    kind, key = match.groups()
+    label = _PLACEHOLDER_LABELS[kind]
+    logger.info(f"Resolving {label}: {key}")
 
-        except Exception as e:
-            logger.error(f"Failed to resolve secret {secret_key}: {e}")
+    try:
+        if not project_id:
+            logger.error(f"PROJECT_ID not found for {label} resolution")
             return value
 
-    # Check for environment variable placeholder
-    elif value.startswith("<environment:") and value.endswith(">"):
-        env_key = value[13:-1]  # Extract key from <environment:keyname>
-        logger.info(f"Resolving environment variable: {env_key}")
+        stage = os.getenv("STAGE", "mock")
+        fetch = _fetch_secret if kind == "secret" else _fetch_env
+        resolved = fetch(key, project_id, stage)
+        if resolved:
+            logger.info(f"{label.capitalize()} {key} resolved successfully")
+            return resolved
+        else:
+            logger.warning(f"{label.capitalize()} {key} not found")
+            return value
 
-        try:
-            # Get project_id from environment or version metadata
-            project_id = os.getenv("PROJECT_ID")
-            if not project_id:
-                version = node_setup_repository.get_or_404(version_uuid)
-                project_id = str(version.project_id) if hasattr(version, 'project_id') else None
-
-            if not project_id:
-                logger.error("PROJECT_ID not found for environment variable resolution")
-                return value
-
-            # Use EnvVarManager to resolve
-            from polysynergy_node_runner.services.env_var_manager import get_env_var_manager
-            env_manager = get_env_var_manager()
-            stage = os.getenv("STAGE", "mock")
-
-            env_value = env_manager.get_var(project_id, stage, env_key)
-            if env_value:
-                logger.info(f"Environment variable {env_key} resolved successfully")
-                return env_value
-            else:
-                logger.warning(f"Environment variable {env_key} not found")
-                return value
+    except Exception as e:
+        logger.error(f"Failed to resolve {label} {key}: {e}")
+        return value
 
-        except Exception as e:
-            logger.error(f"Failed to resolve environment variable {env_key}: {e}")
-            return value
+_oauth_table = None
+_token_client: httpx.AsyncClient | None = None
 
-    # Not a placeholder, return the original value as-is (1-op-1)
-    return value
 
 def get_dynamodb_table():
-    """Get DynamoDB table for OAuth state storage"""
+    """Get DynamoDB table for OAuth state storage
+
+    The resource and table are set up (and the table created if missing) on
+    the first successful call, then shared by later requests.
+    """
+    global _oauth_table
+
+    if _oauth_table is not None:
+        return _oauth_table
+
     try:
         dynamodb = boto3.resource(
             "dynamodb",
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
             region_name=os.getenv("AWS_REGION", "eu-central-1"),
+            config=Config(tcp_keepalive=True, retries={"mode": "standard"}),
         )
 
         table_name = "OAuthTokens"
@@ -141,12 +172,126 @@ def get_dynamodb_table():
             table.wait_until_exists()
             logger.info(f"DynamoDB table {table_name} created successfully")
 
+        _oauth_table = table
         return table
 
     except Exception as e:
         logger.error(f"Failed to connect to DynamoDB: {e}")
         return None
 
+def get_token_client() -> httpx.AsyncClient:
+    """Shared client for token exchanges, so connections to a provider's
+    token endpoint are kept alive between callbacks."""
+    global _token_client
+
+    if _token_client is None:
+        _token_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _token_client
+
+
+async def close_token_client() -> None:
+    global _token_client
+
+    if _token_client is not None:
+        await _token_client.aclose()
+        _token_client = None
+
+
+# Static parts of the callback pages, built once
+_AUTHORIZATION_FAILED_HTML_HEAD = """<html>
+    <head>
+        <title>Authorization Failed</title>
+        <style>
+            body {
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                min-height: 100vh;
+                margin: 0;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            }
+            .container {
+                background: white;
+                padding: 2rem;
+                border-radius: 10px;
+                box-shadow: 0 20px 60px rgba(0,0,0,0.3);
+                max-width: 500px;
+                text-align: center;
+            }
+            h1 { color: #e53e3e; }
+            p { color: #4a5568; margin: 1rem 0; }
+            .error {
+                background: #fff5f5;
+                border: 1px solid #feb2b2;
+                padding: 1rem;
+                border-radius: 5px;
+                color: #c53030;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>❌ Authorization Failed</h1>
+            <div class="error">"""
+_AUTHORIZATION_FAILED_HTML_TAIL = """</div>
+            <p>You can close this window and try again.</p>
+        </div>
+    </body>
+</html>"""
+_AUTHORIZATION_SUCCESS_HTML = """<html>
+    <head>
+        <title>Authorization Successful</title>
+        <style>
+            body {
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                min-height: 100vh;
+                margin: 0;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            }
+            .container {
+                background: white;
+                padding: 2rem;
+                border-radius: 10px;
+                box-shadow: 0 20px 60px rgba(0,0,0,0.3);
+                max-width: 500px;
+                text-align: center;
+            }
+            h1 { color: #48bb78; }
+            p { color: #4a5568; margin: 1rem 0; }
+            .success {
+                background: #f0fff4;
+                border: 1px solid #9ae6b4;
+                padding: 1rem;
+                border-radius: 5px;
+                color: #276749;
+            }
+            .close-hint {
+                margin-top: 2rem;
+                color: #718096;
+                font-size: 0.9rem;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>✅ Authorization Successful!</h1>
+            <div class="success">
+                Your application has been authorized successfully.
+                The flow will continue automatically.
+            </div>
+            <p class="close-hint">You can now close this window.</p>
+        </div>
+    </body>
+</html>""".encode()
+
+
 @router.get("/callback")
 async def oauth_callback(
     code: Optional[str] = Query(None, description="Authorization code from OAuth provider"),
@@ -170,48 +315,7 @@ async def oauth_callback(
 
         # Return user-friendly error page
         return HTMLResponse(
-            content=f"""
-            <html>
-                <head>
-                    <title>Authorization Failed</title>
-                    <style>
-                        body {{
-                            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            min-height: 100vh;
-                            margin: 0;
-                            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                        }}
-                        .container {{
-                            background: white;
-                            padding: 2rem;
-                            border-radius: 10px;
-                            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-                            max-width: 500px;
-                            text-align: center;
-                        }}
-                        h1 {{ color: #e53e3e; }}
-                        p {{ color: #4a5568; margin: 1rem 0; }}
-                        .error {{
-                            background: #fff5f5;
-                            border: 1px solid #feb2b2;
-                            padding: 1rem;
-                            border-radius: 5px;
-                            color: #c53030;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div class="container">
-                        <h1>❌ Authorization Failed</h1>
-                        <div class="error">{error_msg}</div>
-                        <p>You can close this window and try again.</p>
-                    </div>
-                </body>
-            </html>
-            """,
+            content=_AUTHORIZATION_FAILED_HTML_HEAD + html.escape(error_msg) + _AUTHORIZATION_FAILED_HTML_TAIL,
             status_code=400
         )
 
@@ -243,11 +347,12 @@ async def oauth_callback(
 
     # Get OAuth configuration from DynamoDB using session_id (much faster!)
     if session_id:
-        table = get_dynamodb_table()
+        # boto3 calls block, so they run in worker threads
+        table = await asyncio.to_thread(get_dynamodb_table)
         if table:
             try:
                 # Retrieve stored OAuth config
-                response = table.get_item(Key={"node_id": f"oauth_config#{session_id}"})
+                response = await asyncio.to_thread(table.get_item, Key={"node_id": f"oauth_config#{session_id}"})
                 oauth_config = response.get("Item")
 
                 if oauth_config:
@@ -261,8 +366,6 @@ async def oauth_callback(
                     flow_id = oauth_config.get("flow_id")
 
                     # Exchange authorization code for tokens
-                    import httpx
-
                     api_base_url = os.getenv("API_BASE_URL", "http://localhost:8090")
                     redirect_uri = f"{api_base_url}/api/v1/oauth/callback"
 
@@ -280,58 +383,59 @@ async def oauth_callback(
                         "redirect_uri": redirect_uri,
                     }
 
-                    async with httpx.AsyncClient() as client:
-                        response = await client.post(
-                            token_url,
-                            data=token_data,
-                            headers={"Content-Type": "application/x-www-form-urlencoded"},
-                            timeout=30.0
-                        )
-
-                        logger.info(f"[Token Exchange] Response status: {response.status_code}")
-                        logger.info(f"[Token Exchange] Response headers: {dict(response.headers)}")
-
-                        if response.status_code == 200:
-                            token_data = response.json()
-                            logger.info(f"Successfully exchanged authorization code for tokens")
-
-                            # Store tokens in DynamoDB under the actual node_id
-                            token_item = {
-                                "node_id": node_id,
-                                "access_token": token_data.get("access_token"),
-                                "refresh_token": token_data.get("refresh_token"),
-                                "token_type": token_data.get("token_type", "Bearer"),
-                                "expires_in": token_data.get("expires_in"),
-                                "token_timestamp": int(time.time()),
-                                "record_type": "oauth_tokens"  # To distinguish from config records
-                            }
-
-                            if token_data.get("expires_in"):
-                                try:
-                                    expires_in = int(token_data["expires_in"])
-                                    token_item["token_expires"] = int(time.time()) + expires_in
-                                except (ValueError, TypeError) as e:
-                                    logger.warning(f"Invalid expires_in value: {token_data.get('expires_in')}, error: {e}")
-                                    # Don't set token_expires if expires_in is invalid
-
-                            if flow_id:
-                                token_item["flow_id"] = flow_id
-                            if tenant_id:
-                                token_item["tenant_id"] = tenant_id
-
-                            table.put_item(Item=token_item)
-                            logger.info(f"Stored tokens for node {node_id}")
-
-                            # Clean up the temporary OAuth config
+                    response = await get_token_client().post(
+                        token_url,
+                        data=token_data,
+                        headers={"Content-Type": "application/x-www-form-urlencoded"},
+                        timeout=30.0
+                    )
+
+                    logger.info(f"[Token Exchange] Response status: {response.status_code}")
+                    logger.info(f"[Token Exchange] Response headers: {dict(response.headers)}")
+
+                    if response.status_code == 200:
+                        token_data = response.json()
+                        logger.info(f"Successfully exchanged authorization code for tokens")
+
+                        # Store tokens in DynamoDB under the actual node_id
+                        token_item = {
+                            "node_id": node_id,
+                            "access_token": token_data.get("access_token"),
+                            "refresh_token": token_data.get("refresh_token"),
+                            "token_type": token_data.get("token_type", "Bearer"),
+                            "expires_in": token_data.get("expires_in"),
+                            "token_timestamp": int(time.time()),
+                            "record_type": "oauth_tokens"  # To distinguish from config records
+                        }
+
+                        if token_data.get("expires_in"):
                             try:
-                                table.delete_item(Key={"node_id": f"oauth_config#{session_id}"})
-                                logger.info(f"Cleaned up OAuth config for session {session_id}")
-                            except Exception as e:
-                                logger.warning(f"Failed to clean up config: {e}")
+                                expires_in = int(token_data["expires_in"])
+                                token_item["token_expires"] = int(time.time()) + expires_in
+                            except (ValueError, TypeError) as e:
+                                logger.warning(f"Invalid expires_in value: {token_data.get('expires_in')}, error: {e}")
+                                # Don't set token_expires if expires_in is invalid
+
+                        if flow_id:
+                            token_item["flow_id"] = flow_id
+                        if tenant_id:
+                            token_item["tenant_id"] = tenant_id
+
+                        # Store the tokens and clean up the temporary OAuth config
+                        # in one round-trip; the resource's client serializes the
+                        # plain Python values like put_item/delete_item do
+                        await asyncio.to_thread(
+                            table.meta.client.transact_write_items,
+                            TransactItems=[
+                                {"Put": {"TableName": table.name, "Item": token_item}},
+                                {"Delete": {"TableName": table.name, "Key": {"node_id": f"oauth_config#{session_id}"}}},
+                            ]
+                        )
+                        logger.info(f"Stored tokens for node {node_id} and cleaned up OAuth config for session {session_id}")
 
-                        else:
-                            logger.error(f"Failed to exchange authorization code: {response.status_code} - {response.text}")
-                            raise Exception(f"Token exchange failed: {response.text}")
+                    else:
+                        logger.error(f"Failed to exchange authorization code: {response.status_code} - {response.text}")
+                        raise Exception(f"Token exchange failed: {response.text}")
 
                 else:
                     logger.error("OAuth configuration not found or incomplete")
@@ -350,56 +454,7 @@ async def oauth_callback(
         return RedirectResponse(url=redirect_url)
 
     return HTMLResponse(
-        content=f"""
-        <html>
-            <head>
-                <title>Authorization Successful</title>
-                <style>
-                    body {{
-                        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        min-height: 100vh;
-                        margin: 0;
-                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    }}
-                    .container {{
-                        background: white;
-                        padding: 2rem;
-                        border-radius: 10px;
-                        box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-                        max-width: 500px;
-                        text-align: center;
-                    }}
-                    h1 {{ color: #48bb78; }}
-                    p {{ color: #4a5568; margin: 1rem 0; }}
-                    .success {{
-                        background: #f0fff4;
-                        border: 1px solid #9ae6b4;
-                        padding: 1rem;
-                        border-radius: 5px;
-                        color: #276749;
-                    }}
-                    .close-hint {{
-                        margin-top: 2rem;
-                        color: #718096;
-                        font-size: 0.9rem;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>✅ Authorization Successful!</h1>
-                    <div class="success">
-                        Your application has been authorized successfully.
-                        The flow will continue automatically.
-                    </div>
-                    <p class="close-hint">You can now close this window.</p>
-                </div>
-            </body>
-        </html>
-        """,
+        content=_AUTHORIZATION_SUCCESS_HTML,
         status_code=200
     )
 
@@ -482,9 +537,15 @@ async def oauth_authorize(
         if not service_name:
             service_name = "OAuth Service"
 
-        # Resolve secrets and environment variables
-        resolved_client_secret = resolve_variable(client_secret, version_uuid, node_setup_repository) if client_secret else ""
-        resolved_client_id = resolve_variable(client_id, version_uuid, node_setup_repository) if client_id else ""
+        # Resolve secrets and environment variables, against the project from
+        # the environment or else the version metadata
+        project_id = os.getenv("PROJECT_ID")
+        if not project_id:
+            project_id = str(version.project_id) if hasattr(version, 'project_id') else None
+
+        # Secrets Manager / DynamoDB lookups, so off the event loop
+        resolved_client_secret = await asyncio.to_thread(resolve_variable, client_secret, project_id) if client_secret else ""
+        resolved_client_id = await asyncio.to_thread(resolve_variable, client_id, project_id) if client_id else ""
 
         # Build the OAuth authorization URL
         from urllib.parse import urlencode
@@ -498,7 +559,7 @@ async def oauth_authorize(
         session_id = secrets.token_urlsafe(32)
 
         # Store OAuth configuration in DynamoDB for callback to retrieve
-        table = get_dynamodb_table()
+        table = await asyncio.to_thread(get_dynamodb_table)
         if table:
             oauth_config_item = {
                 "node_id": f"oauth_config#{session_id}",  # Use session_id as fake node_id with prefix
@@ -514,7 +575,7 @@ async def oauth_authorize(
                 "record_type": "oauth_config"  # To distinguish from token records
             }
 
-            table.put_item(Item=oauth_config_item)
+            await asyncio.to_thread(table.put_item, Item=oauth_config_item)
             logger.info(f"Stored OAuth config with session_id: {session_id}")
 
         # Build state parameter with session ID
@@ -555,7 +616,7 @@ async def oauth_authorize(
             # Check if we need to add resource parameter (for SharePoint etc)
             resource = variable_map.get("resource", "")
             if resource:
-                oauth_params["resource"] = resolve_variable(resource, version_uuid, node_setup_repository) if resource else resource
+                oauth_params["resource"] = await asyncio.to_thread(resolve_variable, resource, project_id)
 
         # Ensure response_type is always present
         if "response_type" not in oauth_params or not oauth_params["response_type"]:
@@ -616,10 +677,10 @@ async def register_callback(
     state = json.dumps(state_data)
 
     # Store registration in DynamoDB (optional, for tracking)
-    table = get_dynamodb_table()
+    table = await asyncio.to_thread(get_dynamodb_table)
     if table:
         try:
-            table.put_item(Item={
+            await asyncio.to_thread(table.put_item, Item={
                 "node_id": node_id,
                 "flow_id": flow_id,
                 "tenant_id": tenant_id,
@@ -647,12 +708,12 @@ async def check_authorization_code(
     has completed the authorization flow.
     """
 
-    table = get_dynamodb_table()
+    table = await asyncio.to_thread(get_dynamodb_table)
     if not table:
         raise HTTPException(status_code=503, detail="Storage service unavailable")
 
     try:
-        response = table.get_item(Key={"node_id": node_id})
+        response = await asyncio.to_thread(table.get_item, Key={"node_id": node_id})
         item = response.get("Item")
 
         if not item:
@@ -664,7 +725,8 @@ async def check_authorization_code(
 
         if auth_code and time.time() < auth_ttl:
             # Clear the auth code from the record (one-time use)
-            table.update_item(
+            await asyncio.to_thread(
+                table.update_item,
                 Key={"node_id": node_id},
                 UpdateExpression="REMOVE authorization_code, auth_code_timestamp, auth_code_ttl"
             )
@@ -22,7 +22,7 @@ from schemas.embed_token import (
     EmbeddedPromptOut,
 )
 from services.active_listeners_service import get_active_listeners_service
-from services.lambda_service import get_lambda_service, LambdaService
+from services.lambda_service import get_lambda_service, LambdaService, lambda_executor
 from services.mock_sync_service import MockSyncService, get_mock_sync_service
 from services.agno_chat_history_service import AgnoChatHistoryService, get_agno_chat_history_service
 from utils.embed_token_auth import EmbedTokenContext, get_embed_token_context
@@ -217,8 +217,8 @@ async def execute_embedded_chat(
     }
 
     try:
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, lambda_service.invoke_lambda, function_name, payload)
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(lambda_executor, lambda_service.invoke_lambda, function_name, payload)
         return response
     except Exception as e:
         logger.error_ctx("Embedded chat execution failed",
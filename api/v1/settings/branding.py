@@ -1,8 +1,12 @@
 """API endpoints for branding settings (logo and accent color)."""
+import asyncio
+import threading
+from collections.abc import Callable
+
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
 from sqlalchemy.orm import Session
 
-from db.session import get_db
+from db.session import db_context, get_db
 from models import Account
 from utils.get_current_account import get_current_account_admin
 from repositories.global_settings_repository import GlobalSettingsRepository
@@ -11,6 +15,48 @@ from services.s3_service import get_s3_service
 
 router = APIRouter()
 
+# The public GET runs on every page load, while the settings only change through
+# the admin endpoints below; those replace this copy after writing. The version
+# counts those writes, so a GET that loaded the row before a write landed does
+# not store its stale copy.
+_branding_cache: dict | None = None
+_branding_version = 0
+_branding_lock = threading.Lock()
+
+
+def _branding_response(settings) -> dict:
+    # Fix URLs for browser access (replace docker hostname with localhost)
+    logo_url = settings.logo_url.replace("minio:", "localhost:") if settings.logo_url else None
+
+    return {
+        "logo_url": logo_url,
+        "accent_color": settings.accent_color
+    }
+
+
+def _store_branding(settings) -> dict:
+    global _branding_cache, _branding_version
+
+    branding = _branding_response(settings)
+    with _branding_lock:
+        _branding_version += 1
+        _branding_cache = branding
+    return branding
+
+
+def _load_branding() -> dict:
+    with db_context() as db:
+        return _branding_response(GlobalSettingsRepository(db).get())
+
+
+async def get_branding_loader() -> Callable[[], dict]:
+    """Dependency returning the loader used on a cache miss.
+
+    The loader opens its own session, so cached GETs never check one out of
+    the pool. Async, so FastAPI resolves it without a threadpool hop.
+    """
+    return _load_branding
+
 
 @router.get("/test")
 def test_endpoint():
@@ -19,23 +65,25 @@ def test_endpoint():
 
 
 @router.get("/")
-def get_branding_settings(db: Session = Depends(get_db)):
+async def get_branding_settings(load_branding: Callable[[], dict] = Depends(get_branding_loader)):
     """
     Get current branding settings (logo URL and accent color).
 
     Public endpoint - no authentication required.
     Returns the global branding configuration used across the application.
     """
-    repository = GlobalSettingsRepository(db)
-    settings = repository.get()
+    global _branding_cache
 
-    # Fix URLs for browser access (replace docker hostname with localhost)
-    logo_url = settings.logo_url.replace("minio:", "localhost:") if settings.logo_url else None
+    with _branding_lock:
+        branding, version = _branding_cache, _branding_version
+    if branding is not None:
+        return dict(branding)
 
-    return {
-        "logo_url": logo_url,
-        "accent_color": settings.accent_color
-    }
+    branding = await asyncio.to_thread(load_branding)
+    with _branding_lock:
+        if _branding_cache is None and _branding_version == version:
+            _branding_cache = branding
+    return dict(branding)
 
 
 @router.put("/")
@@ -59,13 +107,7 @@ def update_branding_settings(
 
     logger.info(f"After update: logo_url='{settings.logo_url}', accent_color='{settings.accent_color}'")
 
-    # Fix URLs for browser access (replace docker hostname with localhost)
-    logo_url = settings.logo_url.replace("minio:", "localhost:") if settings.logo_url else None
-
-    return {
-        "logo_url": logo_url,
-        "accent_color": settings.accent_color
-    }
+    return dict(_store_branding(settings))
 
 
 @router.post("/logo")
@@ -116,6 +158,8 @@ async def upload_logo(
 
     logger.info(f"After commit: logo_url = '{settings.logo_url}'")
 
+    _store_branding(settings)
+
     return {
         "logo_url": settings.logo_url,
         "accent_color": settings.accent_color
@@ -104,6 +104,9 @@ class Settings(BaseSettings):
     EMAIL_HOST_USER: str
     EMAIL_HOST_PASSWORD: str
     EMAIL_FROM: EmailStr = "no-reply@polysynergy.com"
+    EMAIL_QUEUE_SIZE: int = 1000
+    EMAIL_SEND_RATE: float = 14.0  # Emails per second, matches the default SES send quota
+    EMAIL_SHUTDOWN_TIMEOUT: float = 10.0  # Seconds to keep sending queued email on shutdown
 
     PORTAL_URL: str
     ROUTER_URL: str
@@ -5,7 +5,9 @@ from contextlib import contextmanager
 
 from core.settings import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# Larger compiled-statement cache than the default 500 entries, so the
+# app's full set of ORM statements stays compiled across requests
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, query_cache_size=1200)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
@@ -9,6 +9,7 @@ sys.modules.setdefault("six.moves.urllib.error", six.moves.urllib.error)
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
 import time
 import uuid
 import os
@@ -21,9 +22,10 @@ from api.v1.project import router as v1_project_router
 from api.v1.account import router as v1_account_router
 from api.v1.auth import router as v1_auth_router
 from api.v1.execution import router as v1_execution_router
-from api.v1.documentation.documentation import router as v1_documentation_router
+from api.v1.documentation.documentation import router as v1_documentation_router, warm_documentation_cache
 from api.v1.updates.updates import router as v1_updates_router
-from api.v1.oauth.oauth_callback import router as v1_oauth_router
+from api.v1.oauth import router as v1_oauth_router
+from api.v1.oauth.oauth_callback import close_token_client
 from api.v1.feedback import router as v1_feedback_router
 from api.v1.section_field import router as v1_section_field_router
 from api.v1.public import router as v1_public_router
@@ -33,6 +35,10 @@ from api.v1.utility import router as v1_utility_router
 from ws.v1.execution import router as websocket_execution_router
 from ws.v1.public_chat import router as websocket_public_chat_router
 
+from services.lambda_service import lambda_executor
+from services.email.email_queue import drain_email_queue
+from utils.node_environment import set_node_environment_defaults
+
 from core.settings import settings as _feature_settings
 if _feature_settings.POSSESSION_ENABLED:
     from ws.v1.possession_chat import router as websocket_possession_chat_router
@@ -91,9 +97,23 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("PolySynergy API starting up")
 
+    # Build the documentation search index off the event loop, so the first
+    # /documentation/search does not pay for reading every document
+    async def warm_documentation():
+        try:
+            await asyncio.to_thread(warm_documentation_cache)
+        except Exception as e:
+            logger.error(f"Failed to warm documentation cache: {e}")
+
+    # Keep a reference, so the task is not garbage-collected while it runs
+    warm_documentation_task = asyncio.create_task(warm_documentation())
+
     # Start local schedule service if local execution is enabled
     local_scheduler = None
     if settings.EXECUTE_NODE_SETUP_LOCAL:
+        # Export the static environment node code reads before the first run
+        set_node_environment_defaults()
+
         try:
             from services.local_schedule_service import get_local_schedule_service
             from services.local_schedule_recovery_service import get_local_schedule_recovery_service
@@ -110,9 +130,6 @@ async def lifespan(app: FastAPI):
                 try:
                     recovery_service = get_local_schedule_recovery_service(db)
 
-                    # Import asyncio to run the async recovery method
-                    import asyncio
-
                     # Run recovery in the background
                     async def run_recovery():
                         try:
@@ -136,6 +153,8 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    warm_documentation_task.cancel()
+
     if local_scheduler:
         try:
             local_scheduler.stop()
@@ -143,6 +162,10 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error stopping local schedule service: {e}")
 
+    lambda_executor.shutdown(wait=False, cancel_futures=True)
+    await asyncio.to_thread(drain_email_queue, settings.EMAIL_SHUTDOWN_TIMEOUT)
+    await close_token_client()
+
     logger.info("PolySynergy API shutting down")
 
 app = FastAPI(title="PolySynergy API", version="1.0.0", lifespan=lifespan)
@@ -268,7 +291,7 @@ app.include_router(v1_auth_router, prefix="/api/v1")
 app.include_router(v1_execution_router, prefix="/api/v1")
 app.include_router(v1_documentation_router, prefix="/api/v1/documentation", tags=["documentation"])
 app.include_router(v1_updates_router, prefix="/api/v1/updates", tags=["updates"])
-app.include_router(v1_oauth_router, prefix="/api/v1/oauth")
+app.include_router(v1_oauth_router, prefix="/api/v1")
 app.include_router(v1_feedback_router, prefix="/api/v1")
 app.include_router(v1_section_field_router, prefix="/api/v1/section-field")
 app.include_router(v1_public_router, prefix="/api/v1/public")
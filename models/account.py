@@ -1,5 +1,5 @@
 from typing import List, Optional
-from sqlalchemy import String, Boolean, Enum as SQLEnum
+from sqlalchemy import String, Boolean, Text, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -12,12 +12,17 @@ class AccountRole(str, enum.Enum):
     CHAT_USER = "chat_user"
 
 
+class AuthProvider(str, enum.Enum):
+    COGNITO = "cognito"
+    STANDALONE = "standalone"
+
+
 class Account(Base):
     __tablename__ = "accounts"
 
     # Authentication fields (generic for both SAAS and standalone modes)
     external_user_id: Mapped[str] = mapped_column(String(255), unique=True)  # Was: cognito_id
-    auth_provider: Mapped[str] = mapped_column(String(50), default="cognito")  # "cognito" or "standalone"
+    auth_provider: Mapped[AuthProvider] = mapped_column(SQLEnum(AuthProvider, values_callable=lambda x: [e.value for e in x]), default=AuthProvider.COGNITO)
 
     # Standalone auth fields (only used when auth_provider="standalone")
     password_hash: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -26,6 +31,7 @@ class Account(Base):
     # 2FA/TOTP fields
     totp_secret: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     totp_enabled: Mapped[bool] = mapped_column(Boolean, default=False)
+    totp_qr_code: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Base64 PNG for the pending secret
 
     # User profile fields
     first_name: Mapped[str] = mapped_column(String(100))
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy import ForeignKey, Boolean, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -11,6 +11,12 @@ class ChatWindowAccess(Base):
     __tablename__ = "chat_window_access"
     __table_args__ = (
         UniqueConstraint("account_id", "chat_window_id", name="uix_account_chat_window"),
+        # Serves the my-chat-windows overview with an index-only scan
+        Index(
+            "ix_chat_window_access_account_id_covering",
+            "account_id",
+            postgresql_include=["chat_window_id", "can_view_flow", "can_view_output", "show_response_transparency"],
+        ),
     )
 
     account_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("accounts.id", ondelete="CASCADE"))
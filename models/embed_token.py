@@ -1,7 +1,7 @@
 import uuid
 import secrets
 from datetime import datetime
-from sqlalchemy import String, Boolean, Integer, DateTime, ForeignKey, UUID
+from sqlalchemy import String, Boolean, Integer, DateTime, ForeignKey, UUID, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -33,5 +33,10 @@ class EmbedToken(Base):
     chat_window: Mapped["ChatWindow"] = relationship("ChatWindow", back_populates="embed_tokens")
     project: Mapped["Project"] = relationship("Project", back_populates="embed_tokens")
 
+    __table_args__ = (
+        # Token verification is an exact match on active tokens only
+        Index('ix_embed_tokens_token_hash', 'token', postgresql_using='hash', postgresql_where=text('is_active = true')),
+    )
+
     def __repr__(self):
         return f"<EmbedToken(id={self.id}, chat_window_id={self.chat_window_id}, active={self.is_active})>"
@@ -3,7 +3,7 @@
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Boolean, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Boolean, Integer, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -28,8 +28,7 @@ class SectionFieldAssignment(Base):
     section_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("sections.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     field_id: Mapped[uuid.UUID] = mapped_column(
@@ -62,6 +61,13 @@ class SectionFieldAssignment(Base):
     __table_args__ = (
         # A field can only be assigned once to a section
         UniqueConstraint('section_id', 'field_id', name='uq_section_field_assignment'),
+        # Assignments are read per section in sort_order; INCLUDE allows index-only scans
+        Index(
+            'ix_section_field_assignments_section_id_sort_order',
+            'section_id',
+            'sort_order',
+            postgresql_include=['field_id', 'tab_name', 'is_visible', 'is_required_override'],
+        ),
     )
 
     # Property accessors for field details (for Pydantic serialization)
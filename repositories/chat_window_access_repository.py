@@ -2,13 +2,37 @@ from uuid import UUID, uuid4
 from typing import List
 
 from fastapi import Depends, HTTPException
+from sqlalchemy import Row, bindparam, select
 from sqlalchemy.orm import Session, joinedload
 
 from db.session import get_db
-from models import ChatWindowAccess, ChatWindow, Account
+from models import ChatWindowAccess, ChatWindow, Account, Project, Tenant
 from schemas.chat_window_access import ChatWindowAccessCreateIn, ChatWindowAccessUpdateIn
 
 
+# Built once at import: every dashboard load reuses the same statement object,
+# so only the account_id bind changes and the compiled form stays cached.
+_CHAT_WINDOWS_WITH_DETAILS_STMT = (
+    select(
+        ChatWindow.id.label("chat_window_id"),
+        ChatWindow.name.label("chat_window_name"),
+        ChatWindow.description.label("chat_window_description"),
+        Project.id.label("project_id"),
+        Project.name.label("project_name"),
+        Tenant.id.label("tenant_id"),
+        Tenant.name.label("tenant_name"),
+        ChatWindowAccess.can_view_flow,
+        ChatWindowAccess.can_view_output,
+        ChatWindowAccess.show_response_transparency,
+    )
+    .select_from(ChatWindowAccess)
+    .join(ChatWindow, ChatWindowAccess.chat_window_id == ChatWindow.id)
+    .join(Project, ChatWindow.project_id == Project.id)
+    .join(Tenant, Project.tenant_id == Tenant.id)
+    .where(ChatWindowAccess.account_id == bindparam("account_id"))
+)
+
+
 class ChatWindowAccessRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -106,29 +130,16 @@ class ChatWindowAccessRepository:
             .all()
         )
 
-    def get_chat_windows_with_details_for_account(self, account_id: UUID):
-        """Get all chat windows for an account with project and tenant details."""
-        from models import ChatWindow, Project
-
-        accesses = (
-            self.db.query(ChatWindowAccess)
-            .filter(ChatWindowAccess.account_id == account_id)
-            .options(joinedload(ChatWindowAccess.chat_window))
-            .all()
-        )
+    def get_chat_windows_with_details_for_account(self, account_id: UUID) -> List[Row]:
+        """Get all chat windows for an account with project and tenant details.
 
-        # Manually load project and tenant for each chat window
-        for access in accesses:
-            if access.chat_window:
-                project = (
-                    self.db.query(Project)
-                    .filter(Project.id == access.chat_window.project_id)
-                    .options(joinedload(Project.tenant))
-                    .first()
-                )
-                access.chat_window.project = project
-
-        return accesses
+        Everything is fetched in a single query; the inner joins drop accesses
+        whose chat window or project no longer exists. Only the columns the
+        caller needs are selected, so no ORM entities are hydrated.
+        """
+        return self.db.execute(
+            _CHAT_WINDOWS_WITH_DETAILS_STMT, {"account_id": account_id}
+        ).all()
 
 
 def get_chat_window_access_repository(
@@ -59,7 +59,8 @@ class TokenResponse(BaseModel):
 
 class Enable2FAResponse(BaseModel):
     secret: str
-    qr_code: str  # Base64 encoded PNG
+    otpauth_uri: str
+    qr_code: str  # Base64 encoded PNG, also served as image/png by GET /2fa/qr
     backup_codes: list[str]
 
 
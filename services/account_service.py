@@ -1,5 +1,7 @@
+import threading
 import uuid as uuid_module
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 from starlette.background import BackgroundTasks
 
@@ -11,6 +13,13 @@ from utils.generate_temporary_password import generate_temporary_password
 from services.email.email_service import EmailService
 
 
+# Token refreshes only need to know that an account still exists and is active.
+# An active account only stops being active when it is deleted, so positive
+# answers are cached briefly and dropped again in delete_account.
+_active_external_user_ids = TTLCache(maxsize=10_000, ttl=30)
+_active_external_user_ids_lock = threading.Lock()
+
+
 class AccountService:
 
     @staticmethod
@@ -28,6 +37,72 @@ class AccountService:
             select(Account).where(Account.external_user_id == external_user_id)
         ).scalar_one_or_none()
 
+    @staticmethod
+    def get_by_email(session: Session, email: str) -> Account | None:
+        """Get account by email address.
+
+        Args:
+            session: Database session
+            email: Account email address
+
+        Returns:
+            Account if found, None otherwise
+        """
+        return session.execute(
+            select(Account).where(Account.email == email)
+        ).scalar_one_or_none()
+
+    @staticmethod
+    def get_login_credentials(session: Session, email: str) -> Row | None:
+        """Get the columns login needs for the account with this email.
+
+        Returns a plain row instead of an Account entity, so login does not
+        pay for ORM hydration and identity-map bookkeeping.
+
+        Args:
+            session: Database session
+            email: Account email address
+
+        Returns:
+            Row with external_user_id, email, auth_provider, password_hash,
+            active, totp_enabled and totp_secret if found, None otherwise
+        """
+        return session.execute(
+            select(
+                Account.external_user_id,
+                Account.email,
+                Account.auth_provider,
+                Account.password_hash,
+                Account.active,
+                Account.totp_enabled,
+                Account.totp_secret,
+            ).where(Account.email == email)
+        ).first()
+
+    @staticmethod
+    def is_active_external_user(session: Session, external_user_id: str) -> bool:
+        """Check that an account exists for the external user ID and is active.
+
+        Args:
+            session: Database session
+            external_user_id: External auth provider user ID
+
+        Returns:
+            True if the account exists and is active, False otherwise
+        """
+        with _active_external_user_ids_lock:
+            if external_user_id in _active_external_user_ids:
+                return True
+
+        active = session.execute(
+            select(Account.active).where(Account.external_user_id == external_user_id)
+        ).scalar_one_or_none()
+
+        if active:
+            with _active_external_user_ids_lock:
+                _active_external_user_ids[external_user_id] = True
+        return bool(active)
+
     @staticmethod
     def get_by_cognito_id(session: Session, cognito_id: str) -> Account | None:
         """Legacy method for backwards compatibility. Use get_by_external_user_id instead."""
@@ -244,9 +319,9 @@ class AccountService:
         )
 
     @staticmethod
-    def update_account(session: Session, account_id: str, updates: dict) -> Account:
+    def update_account(session: Session, account_id: uuid_module.UUID, updates: dict) -> Account:
         account = session.execute(
-            select(Account).where(Account.id == uuid_module.UUID(account_id))
+            select(Account).where(Account.id == account_id)
         ).scalar_one_or_none()
 
         if not account:
@@ -295,5 +370,9 @@ class AccountService:
             print(f"Warning: Failed to delete user from auth provider: {e}")
 
         # Delete from database
+        external_user_id = account.external_user_id
         session.delete(account)
-        session.commit()
\ No newline at end of file
+        session.commit()
+
+        with _active_external_user_ids_lock:
+            _active_external_user_ids.pop(external_user_id, None)
\ No newline at end of file
@@ -1,5 +1,7 @@
+import heapq
 import json
 import os
+import time
 import hashlib
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -7,12 +9,14 @@ import re
 from datetime import datetime
 
 class DocumentationService:
-    def __init__(self, documentation_path: str = None):
+    def __init__(self, documentation_path: str = None, refresh_interval: float = 0.0):
         """Initialize the documentation service.
         
         Args:
             documentation_path: Path to the documentation directory. 
                                If None, will look for documentation/ in the project root.
+            refresh_interval: Seconds between checks of the documentation files
+                              in refresh_if_changed. 0 checks on every call.
         """
         if documentation_path is None:
             # Get project root (go up from api-local to orchestrator root)
@@ -24,7 +28,58 @@ class DocumentationService:
         self.manifest_path = self.documentation_path / "manifest.json"
         self._manifest = None
         self._search_index = None
+        self._search_fields = None
+        self._search_terms = None
+        self.refresh_interval = refresh_interval
+        self._source_version = None
+        self._source_checked_at = None
+
+    def source_version(self) -> tuple[int, float]:
+        """Number and latest modification time of the manifest and markdown files.
+
+        The count makes deleting a file a change too, which the latest mtime
+        alone would not show.
+        """
+        if not self.documentation_path.exists():
+            return 0, 0.0
+        mtimes = [
+            path.stat().st_mtime
+            for path in self.documentation_path.rglob("*")
+            if path.suffix in (".md", ".json")
+        ]
+        return len(mtimes), max(mtimes, default=0.0)
+
+    def refresh_if_changed(self) -> tuple[int, float]:
+        """Drop the cached manifest and search index if any source file changed.
+
+        The files are checked at most once per refresh_interval; in between,
+        the last seen version is returned.
+
+        Returns:
+            The current source version, usable as a cache key for derived data.
+        """
+        now = time.monotonic()
+        if (
+            self._source_checked_at is not None
+            and now - self._source_checked_at < self.refresh_interval
+        ):
+            return self._source_version
+
+        version = self.source_version()
+        self._source_checked_at = now
+        if version != self._source_version:
+            self._manifest = None
+            self._search_index = None
+            self._search_fields = None
+            self._search_terms = None
+            self._source_version = version
+        return version
     
+    def warm(self) -> None:
+        """Load the manifest and build the search index ahead of the first request."""
+        self.refresh_if_changed()
+        self._build_search_index()
+
     def _load_manifest(self) -> Dict[str, Any]:
         """Load the documentation manifest."""
         if self._manifest is None:
@@ -217,7 +272,12 @@ class DocumentationService:
         return None
     
     def _build_search_index(self) -> List[Dict[str, Any]]:
-        """Build search index from all documentation."""
+        """Build search index from all documentation.
+
+        Alongside the entries this keeps their lowercased fields and an
+        inverted index of terms to entry positions, so a query only scores
+        the entries that can contain it.
+        """
         if self._search_index is not None:
             return self._search_index
         
@@ -238,9 +298,38 @@ class DocumentationService:
                     "url": f"/documentation/{category}/{doc['id']}"
                 })
         
+        fields = []
+        terms: Dict[str, set] = {}
+        for position, item in enumerate(index):
+            title = item["title"].lower()
+            description = item["description"].lower()
+            tags = [tag.lower() for tag in item["tags"]]
+            content = item["content"].lower()
+            fields.append((title, description, tags, content))
+
+            for text in (title, description, content, *tags):
+                for term in re.findall(r"\w+", text):
+                    terms.setdefault(term, set()).add(position)
+
+        self._search_fields = fields
+        self._search_terms = terms
         self._search_index = index
         return index
     
+    def _search_candidates(self, query_lower: str) -> List[int]:
+        """Positions of index entries that may contain the query, in index order."""
+        if not re.fullmatch(r"\w+", query_lower):
+            # Queries spanning several terms fall back to scoring every entry
+            return list(range(len(self._search_index)))
+
+        # A single-term query can only occur inside a term, so scan the
+        # vocabulary rather than the document text
+        positions = set()
+        for term, term_positions in self._search_terms.items():
+            if query_lower in term:
+                positions |= term_positions
+        return sorted(positions)
+    
     def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Search through all documentation."""
         if not query or len(query) < 2:
@@ -250,32 +339,33 @@ class DocumentationService:
         query_lower = query.lower()
         results = []
         
-        for item in index:
+        for position in self._search_candidates(query_lower):
+            item = index[position]
+            title_lower, description_lower, tags_lower, content_lower = self._search_fields[position]
             score = 0
             
             # Title match (highest weight)
-            if query_lower in item["title"].lower():
+            if query_lower in title_lower:
                 score += 10
-                if item["title"].lower().startswith(query_lower):
+                if title_lower.startswith(query_lower):
                     score += 5
             
             # Description match
-            if query_lower in item["description"].lower():
+            if query_lower in description_lower:
                 score += 5
             
             # Tags match
-            for tag in item["tags"]:
-                if query_lower in tag.lower():
+            for tag in tags_lower:
+                if query_lower in tag:
                     score += 3
             
             # Content match (lowest weight, but check for multiple matches)
-            content_matches = item["content"].lower().count(query_lower)
+            content_matches = content_lower.count(query_lower)
             if content_matches > 0:
                 score += min(content_matches, 5)  # Cap at 5 points for content
             
             if score > 0:
                 # Extract snippet around first match
-                content_lower = item["content"].lower()
                 match_pos = content_lower.find(query_lower)
                 if match_pos >= 0:
                     start = max(0, match_pos - 100)
@@ -294,9 +384,8 @@ class DocumentationService:
                     "snippet": snippet
                 })
         
-        # Sort by score (descending) and return limited results
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:limit]
+        # Highest scores first; nlargest keeps index order for equal scores
+        return heapq.nlargest(limit, results, key=lambda x: x["score"])
     
     def get_categories(self) -> List[Dict[str, Any]]:
         """Get all documentation categories."""
@@ -0,0 +1,74 @@
+"""Bounded in-process queue for outgoing email.
+
+Emails put on this queue are sent by a single daemon thread, so a request does
+not hold a worker slot while SES/SMTP responds, and bursts are sent at a rate
+the mail provider accepts (EMAIL_SEND_RATE per second).
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_email_queue: queue.Queue = queue.Queue(maxsize=settings.EMAIL_QUEUE_SIZE)
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+
+
+def enqueue_email(send: Callable[..., Any], *args: Any) -> None:
+    """Queue send(*args) for the email worker.
+
+    Never blocks the caller: if the queue is full the email is dropped and
+    logged instead.
+    """
+    _ensure_worker()
+    try:
+        _email_queue.put_nowait((send, args))
+    except queue.Full:
+        logger.error(f"Email queue full, dropping email to {args[0] if args else 'unknown recipient'}")
+
+
+def drain_email_queue(timeout: float) -> None:
+    """Wait up to timeout seconds for the queued emails to be sent.
+
+    Called on shutdown: the worker is a daemon thread, so anything still
+    queued when the process exits would be lost.
+    """
+    deadline = time.monotonic() + timeout
+    with _email_queue.all_tasks_done:
+        while _email_queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error(f"Shutting down with {_email_queue.unfinished_tasks} queued emails unsent")
+                return
+            _email_queue.all_tasks_done.wait(remaining)
+
+
+def _ensure_worker() -> None:
+    global _worker
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="email-queue", daemon=True)
+            _worker.start()
+
+
+def _run() -> None:
+    interval = 1 / settings.EMAIL_SEND_RATE
+    while True:
+        send, args = _email_queue.get()
+        started = time.monotonic()
+        try:
+            send(*args)
+        except Exception:
+            logger.exception("Failed to send queued email")
+        finally:
+            _email_queue.task_done()
+
+        elapsed = time.monotonic() - started
+        if elapsed < interval:
+            time.sleep(interval - elapsed)
@@ -5,6 +5,7 @@ from fastapi import BackgroundTasks
 from botocore.exceptions import ClientError
 import logging
 from core.settings import settings
+from services.email.email_queue import enqueue_email
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 template_env = Environment(
@@ -58,8 +59,7 @@ class EmailService:
         user_email: str,
         message: str,
         timestamp: str,
-        user_agent: str | None,
-        background_tasks: BackgroundTasks
+        user_agent: str | None
     ):
         """Send feedback email to admin"""
         admin_email = "dion@polysynergy.com"
@@ -92,15 +92,10 @@ class EmailService:
         """
 
         # Send feedback email (user email is visible in the email body)
-        background_tasks.add_task(
-            EmailService._send_email,
-            admin_email,
-            subject,
-            html_body
-        )
+        enqueue_email(EmailService._send_email, admin_email, subject, html_body)
 
     @staticmethod
-    def send_email_verification(to: str, first_name: str, verification_url: str, background_tasks: BackgroundTasks):
+    def send_email_verification(to: str, first_name: str, verification_url: str):
         """Send email verification link (standalone mode)."""
         subject = "Verify Your Email - PolySynergy"
 
@@ -126,10 +121,10 @@ class EmailService:
         </html>
         """
 
-        background_tasks.add_task(EmailService._send_email, to, subject, html_body)
+        enqueue_email(EmailService._send_email, to, subject, html_body)
 
     @staticmethod
-    def send_password_reset(to: str, first_name: str, reset_url: str, background_tasks: BackgroundTasks):
+    def send_password_reset(to: str, first_name: str, reset_url: str):
         """Send password reset link (standalone mode)."""
         subject = "Reset Your Password - PolySynergy"
 
@@ -155,7 +150,7 @@ class EmailService:
         </html>
         """
 
-        background_tasks.add_task(EmailService._send_email, to, subject, html_body)
+        enqueue_email(EmailService._send_email, to, subject, html_body)
 
     @staticmethod
     def _send_email(to: str, subject: str, html_body: str, reply_to: str = None):
@@ -218,9 +213,9 @@ class EmailService:
 
         try:
             fm = FastMail(conf)
-            # Note: This is sync context, but FastMail can handle it
+            # Called from worker threads, which have no running event loop
             import asyncio
-            asyncio.create_task(fm.send_message(message))
+            asyncio.run(fm.send_message(message))
         except Exception as e:
             logging.error(f"Failed to send email via SMTP: {str(e)}")
             raise
\ No newline at end of file
@@ -1,12 +1,18 @@
 import json
 import boto3
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from core.settings import settings
 from botocore.exceptions import ClientError
 from botocore.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Lambda invokes can block a thread for up to the function timeout; they get
+# their own pool (sized to the client's connection pool) so they never queue
+# up behind, or starve, asyncio.to_thread work on the default executor.
+lambda_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="lambda-invoke")
+
 class LambdaService:
     def __init__(self):
         self._lambda_client = boto3.client(
@@ -17,6 +23,8 @@ class LambdaService:
             config=Config(
                 read_timeout=910,
                 connect_timeout=5,
+                max_pool_connections=64,
+                tcp_keepalive=True,
                 retries={
                     'max_attempts': 1,
                     'mode': 'standard'
@@ -227,6 +235,32 @@ class LambdaService:
             logger.error(f"Fout bij aanroepen van Lambda {function_name}: {str(e)}")
             raise
 
+    def invoke_lambda_event(self, function_name: str, payload: dict) -> int:
+        """Queue an asynchronous (InvocationType=Event) invocation.
+
+        Returns as soon as Lambda has accepted the event; Lambda retries
+        failed executions itself. A function that is still updating rejects
+        the event outright, so that case waits for the function once and retries.
+        """
+        logger.debug(f"Queueing Lambda event: {function_name}")
+        kwargs = dict(
+            FunctionName=function_name,
+            InvocationType='Event',
+            Payload=json.dumps(payload).encode(),
+        )
+        try:
+            response = self._lambda_client.invoke(**kwargs)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ResourceConflictException':
+                logger.error(f"Fout bij aanroepen van Lambda {function_name}: {str(e)}")
+                raise
+            logger.warning(f"Lambda {function_name} is updating, waiting before queueing event")
+            self._lambda_client.get_waiter('function_active_v2').wait(FunctionName=function_name)
+            self._lambda_client.get_waiter('function_updated_v2').wait(FunctionName=function_name)
+            response = self._lambda_client.invoke(**kwargs)
+
+        return response['StatusCode']
+
     def delete_lambda(self, function_name: str) -> None:
         try:
             logger.debug(f"Deleting Lambda function: {function_name}")
@@ -238,5 +272,15 @@ class LambdaService:
             logger.error(f"Error deleting Lambda {function_name}: {str(e)}")
             raise
 
+
+_lambda_service_instance: LambdaService | None = None
+
+
 def get_lambda_service():
-    return LambdaService()
\ No newline at end of file
+    # boto3 clients are thread-safe; share one instance so invocations reuse
+    # the client's pooled HTTPS connections instead of a fresh handshake each request.
+    global _lambda_service_instance
+
+    if _lambda_service_instance is None:
+        _lambda_service_instance = LambdaService()
+    return _lambda_service_instance
\ No newline at end of file
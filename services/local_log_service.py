@@ -1,42 +1,51 @@
+import io
+import sys
 import threading
 import time
-from typing import List, Dict, Optional
+from contextvars import ContextVar
+from functools import partial
+from typing import Iterable, List, Dict, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 
 
 class LocalLogService:
     """Service for capturing and storing logs during local node execution."""
     
-    # In-memory storage for logs by version_id
-    _logs_storage = defaultdict(list)
-    _lock = threading.Lock()
-    _last_cleanup = time.time()
-    
     # Configuration
     MAX_LOGS_PER_VERSION = 1000
     LOG_TTL_SECONDS = 3600  # 1 hour
     CLEANUP_INTERVAL = 300  # 5 minutes
     
+    # In-memory storage for logs by version_id; each version is a ring buffer
+    # that drops its oldest entry once MAX_LOGS_PER_VERSION is reached
+    _logs_storage = defaultdict(partial(deque, maxlen=MAX_LOGS_PER_VERSION))
+    _lock = threading.Lock()
+    _last_cleanup = time.time()
+    
     @classmethod
     def add_log(cls, version_id: str, message: str, variant: str = "local"):
         """Add a log entry for a specific version."""
+        cls.add_logs(version_id, (message,), variant)
+    
+    @classmethod
+    def add_logs(cls, version_id: str, messages: Iterable[str], variant: str = "local"):
+        """Add several log entries for a specific version under a single lock."""
         timestamp = int(time.time() * 1000)  # Milliseconds like CloudWatch
+        function = f"node_setup_{version_id}_{variant}"
         
-        log_entry = {
-            "function": f"node_setup_{version_id}_{variant}",
-            "timestamp": timestamp,
-            "message": message,
-            "variant": variant
-        }
+        entries = [
+            {
+                "function": function,
+                "timestamp": timestamp,
+                "message": message,
+                "variant": variant
+            }
+            for message in messages
+        ]
         
         with cls._lock:
-            # Add log entry
-            cls._logs_storage[version_id].append(log_entry)
-            
-            # Keep only the most recent logs to prevent memory issues
-            if len(cls._logs_storage[version_id]) > cls.MAX_LOGS_PER_VERSION:
-                cls._logs_storage[version_id] = cls._logs_storage[version_id][-cls.MAX_LOGS_PER_VERSION:]
+            cls._logs_storage[version_id].extend(entries)
             
             # Periodic cleanup of old logs
             if time.time() - cls._last_cleanup > cls.CLEANUP_INTERVAL:
@@ -69,14 +78,13 @@ class LocalLogService:
         cutoff_time = int((time.time() - cls.LOG_TTL_SECONDS) * 1000)
         
         for version_id in list(cls._logs_storage.keys()):
-            original_count = len(cls._logs_storage[version_id])
-            cls._logs_storage[version_id] = [
-                log for log in cls._logs_storage[version_id]
-                if log["timestamp"] > cutoff_time
-            ]
+            # Entries are appended in time order, so expired ones sit at the front
+            logs = cls._logs_storage[version_id]
+            while logs and logs[0]["timestamp"] <= cutoff_time:
+                logs.popleft()
             
             # Remove empty entries
-            if not cls._logs_storage[version_id]:
+            if not logs:
                 del cls._logs_storage[version_id]
     
     @classmethod
@@ -92,39 +100,74 @@ class LocalLogService:
             }
 
 
+# LogCapture currently collecting output in this context, if any. asyncio tasks
+# and asyncio.to_thread copy the context, so concurrent runs each see their own.
+_active_capture: ContextVar[Optional["LogCapture"]] = ContextVar("_active_capture", default=None)
+_install_lock = threading.Lock()
+
+
+class _ContextStream:
+    """Stand-in for sys.stdout/sys.stderr that writes to the active LogCapture.
+
+    Installed once for the whole process instead of swapping the streams per
+    run, so overlapping runs cannot restore each other's stream. Writes made
+    outside of a capture go to the wrapped original stream.
+    """
+
+    def __init__(self, original, buffer_name: str):
+        self._original = original
+        self._buffer_name = buffer_name
+
+    def _target(self):
+        capture = _active_capture.get()
+        if capture is None:
+            return self._original
+        return getattr(capture, self._buffer_name)
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def writelines(self, lines):
+        self._target().writelines(lines)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._original, name)
+
+
+def _install_stream_proxies():
+    """Wrap sys.stdout/sys.stderr in a _ContextStream unless already wrapped."""
+    with _install_lock:
+        if not isinstance(sys.stdout, _ContextStream):
+            sys.stdout = _ContextStream(sys.stdout, "stdout_buffer")
+        if not isinstance(sys.stderr, _ContextStream):
+            sys.stderr = _ContextStream(sys.stderr, "stderr_buffer")
+
+
 class LogCapture:
     """Context manager to capture stdout/stderr during local execution."""
     
     def __init__(self, version_id: str, variant: str = "local"):
         self.version_id = version_id
         self.variant = variant
-        self.original_stdout = None
-        self.original_stderr = None
         self.captured_output = []
+        self._token = None
     
     def __enter__(self):
-        import sys
-        import io
-        
-        self.original_stdout = sys.stdout
-        self.original_stderr = sys.stderr
-        
         # Create string buffers
         self.stdout_buffer = io.StringIO()
         self.stderr_buffer = io.StringIO()
         
-        # Replace stdout/stderr with our buffers
-        sys.stdout = self.stdout_buffer
-        sys.stderr = self.stderr_buffer
+        # Route this context's stdout/stderr to our buffers
+        _install_stream_proxies()
+        self._token = _active_capture.set(self)
         
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        import sys
-        
-        # Restore original stdout/stderr
-        sys.stdout = self.original_stdout
-        sys.stderr = self.original_stderr
+        _active_capture.reset(self._token)
         
         # Capture the output
         stdout_content = self.stdout_buffer.getvalue()
@@ -137,17 +180,17 @@ class LogCapture:
         """Process captured stdout/stderr and store as individual log entries."""
 
         # Process stdout
-        if stdout_content.strip():
-            for line in stdout_content.strip().split('\n'):
-                if line.strip():  # Skip empty lines
-                    LocalLogService.add_log(self.version_id, line.strip(), self.variant)
+        messages = [line.strip() for line in stdout_content.split('\n') if line.strip()]
 
         # Process stderr with smart log level detection
-        if stderr_content.strip():
-            for line in stderr_content.strip().split('\n'):
-                if line.strip():  # Skip empty lines
-                    processed_message = self._smart_process_stderr_line(line.strip())
-                    LocalLogService.add_log(self.version_id, processed_message, self.variant)
+        messages.extend(
+            self._smart_process_stderr_line(line.strip())
+            for line in stderr_content.split('\n')
+            if line.strip()
+        )
+
+        if messages:
+            LocalLogService.add_logs(self.version_id, messages, self.variant)
 
     def _smart_process_stderr_line(self, line: str) -> str:
         """Smart processing of stderr lines to preserve original log levels."""
@@ -15,6 +15,8 @@ from typing import Dict, Any, Optional
 
 from models.schedule import Schedule
 from services.local_log_service import LogCapture
+from utils.node_environment import set_node_project
+from utils.node_setup_code import compile_node_setup
 
 logger = logging.getLogger(__name__)
 
@@ -94,9 +96,7 @@ class ScheduleExecutor:
             schedule: Schedule object
         """
         # Set core environment variables like in mock execution
-        os.environ['PROJECT_ID'] = str(schedule.project_id)
-        if hasattr(schedule, 'tenant_id') and schedule.tenant_id:
-            os.environ['TENANT_ID'] = str(schedule.tenant_id)
+        set_node_project(schedule.project_id, getattr(schedule, 'tenant_id', None))
 
         # Add schedule-specific environment variables
         os.environ['SCHEDULE_ID'] = str(schedule.id)
@@ -132,7 +132,7 @@ class ScheduleExecutor:
 
                 # Execute the schedule code (same as mock execution)
                 log_capture.add_custom_log("Loading and executing node setup code...")
-                exec(schedule.code, namespace)
+                exec(compile_node_setup(schedule.code), namespace)
                 log_capture.add_custom_log("Code loaded successfully, looking for lambda_handler...")
 
                 # Call lambda_handler if it exists (like in Lambda execution)
@@ -5,6 +5,15 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from models import Project, Account, NodeSetupVersion
+from api.v1.execution import details
+from services.active_listeners_service import get_active_listeners_service
+from services.execution_storage_service import get_execution_storage_service
+from services.lambda_service import get_lambda_service
+
+
+@pytest.fixture(autouse=True)
+def clear_node_result_cache():
+    details._node_results.clear()
 
 
 @pytest.mark.integration
@@ -30,6 +39,60 @@ class TestExecutionDetailsEndpoints:
         mock_storage.get_node_result.assert_called_once_with(
             "flow123", "run456", "node789", 1, "mock", "mock"
         )
+
+    @patch('api.v1.execution.details.get_execution_storage_service')
+    def test_get_node_result_cached(self, mock_get_storage, client: TestClient):
+        """Test repeat reads of a node result are served from the cache."""
+        mock_storage = Mock()
+        mock_storage.get_node_result.return_value = {"node_id": "test-node"}
+        mock_get_storage.return_value = mock_storage
+
+        for _ in range(2):
+            response = client.get("/api/v1/execution/flow123/run456/node789/1")
+            assert response.status_code == 200
+
+        mock_storage.get_node_result.assert_called_once()
+
+    def test_get_node_result_miss_not_cached(self, client: TestClient):
+        """Test a result written after a 404 is returned on the next read."""
+        mock_storage = Mock()
+        mock_storage.get_node_result.side_effect = [None, {"node_id": "test-node"}]
+        client.app.dependency_overrides[get_execution_storage_service] = lambda: mock_storage
+
+        assert client.get("/api/v1/execution/flow123/run456/node789/1").status_code == 404
+        assert client.get("/api/v1/execution/flow123/run456/node789/1").status_code == 200
+
+    @patch('api.v1.execution.resume.execute_resume_local', new_callable=AsyncMock)
+    @patch('api.v1.execution.resume._load_version_and_project')
+    @patch('api.v1.execution.resume.settings')
+    def test_resume_drops_cached_node_results(self, mock_settings, mock_load, mock_execute,
+                                              client: TestClient):
+        """Test resuming a run drops its cached node results, and only those."""
+        flow_id = str(uuid.uuid4())
+        mock_storage = Mock()
+        mock_storage.get_node_result.return_value = {"node_id": "test-node"}
+        mock_settings.EXECUTE_NODE_SETUP_LOCAL = True
+        mock_load.return_value = (Mock(), None)
+        mock_execute.return_value = {"status": "resumed"}
+        client.app.dependency_overrides.update({
+            get_execution_storage_service: lambda: mock_storage,
+            get_active_listeners_service: lambda: Mock(),
+            get_lambda_service: lambda: Mock(),
+        })
+
+        client.get(f"/api/v1/execution/{flow_id}/run456/node789/1")
+        client.get(f"/api/v1/execution/{flow_id}/other-run/node789/1")
+        assert mock_storage.get_node_result.call_count == 2
+
+        response = client.post(f"/api/v1/execution/{flow_id}/resume/", json={
+            "run_id": "run456", "resume_node_id": "node789", "user_input": True
+        })
+        assert response.status_code == 200
+        mock_execute.assert_awaited_once()
+
+        client.get(f"/api/v1/execution/{flow_id}/run456/node789/1")
+        client.get(f"/api/v1/execution/{flow_id}/other-run/node789/1")
+        assert mock_storage.get_node_result.call_count == 3
     
     @patch('api.v1.execution.details.get_execution_storage_service')
     def test_get_node_result_not_found(self, mock_get_storage, client: TestClient):
@@ -116,6 +116,20 @@ class TestNodesEndpoints:
         data = response.json()
         assert "Cannot import polysynergy_nodes" in data["error"]
     
+    @patch('api.v1.nodes.nodes.discover_nodes')
+    def test_list_nodes_not_modified(self, mock_discover_nodes, client: TestClient):
+        """Test a matching If-None-Match header returns 304 without a body."""
+        mock_discover_nodes.return_value = [{"id": "math_add", "name": "Math Add"}]
+
+        response = client.get("/api/v1/nodes/")
+        etag = response.headers["ETag"]
+
+        response = client.get("/api/v1/nodes/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
     @patch('api.v1.nodes.nodes.discover_nodes')
     def test_list_nodes_mixed_categories(self, mock_discover_nodes, client: TestClient):
         """Test node listing with nodes from different categories."""
@@ -22,9 +22,54 @@ class TestAccountService:
     def test_get_by_cognito_id_not_found(self, db_session: Session):
         """Test getting account by cognito ID when account doesn't exist."""
         result = AccountService.get_by_cognito_id(db_session, "nonexistent-cognito-id")
-        
+
         assert result is None
-    
+
+    def test_get_by_email(self, db_session: Session, sample_account: Account):
+        """Test getting account by email."""
+        result = AccountService.get_by_email(db_session, sample_account.email)
+
+        assert result is not None
+        assert result.id == sample_account.id
+        assert AccountService.get_by_email(db_session, "nobody@example.com") is None
+
+    def test_get_login_credentials(self, db_session: Session, sample_account: Account):
+        """Test getting the login columns by email."""
+        row = AccountService.get_login_credentials(db_session, sample_account.email)
+
+        assert row is not None
+        assert row.external_user_id == sample_account.external_user_id
+        assert row.active is True
+        assert AccountService.get_login_credentials(db_session, "nobody@example.com") is None
+
+    def test_is_active_external_user(self, db_session: Session):
+        """Test active check for active, inactive and unknown external user IDs."""
+        db_session.add_all([
+            Account(external_user_id="active-user", email="active@example.com",
+                    first_name="Active", last_name="User", active=True),
+            Account(external_user_id="inactive-user", email="inactive@example.com",
+                    first_name="Inactive", last_name="User", active=False),
+        ])
+        db_session.commit()
+
+        assert AccountService.is_active_external_user(db_session, "active-user") is True
+        assert AccountService.is_active_external_user(db_session, "inactive-user") is False
+        assert AccountService.is_active_external_user(db_session, "unknown-user") is False
+
+    @patch('services.account_service.get_auth_provider')
+    def test_is_active_external_user_after_delete(self, mock_get_auth_provider, db_session: Session):
+        """Test a cached active check is dropped when the account is deleted."""
+        account = Account(external_user_id="deleted-user", email="deleted@example.com",
+                          first_name="Deleted", last_name="User", active=True)
+        db_session.add(account)
+        db_session.commit()
+
+        assert AccountService.is_active_external_user(db_session, "deleted-user") is True
+
+        AccountService.delete_account(db_session, str(account.id))
+
+        assert AccountService.is_active_external_user(db_session, "deleted-user") is False
+
     def test_get_users_for_tenant_success(self, db_session: Session, sample_account: Account, sample_tenant: Tenant):
         """Test getting users for tenant when membership exists."""
         # Create membership for the account
@@ -0,0 +1,107 @@
+import json
+import os
+
+import pytest
+
+from services.documentation_service import DocumentationService
+
+
+@pytest.fixture
+def documentation_path(tmp_path):
+    manifest = {
+        "categories": [{"id": "guides", "title": "Guides"}],
+        "navigation": [
+            {
+                "category": "guides",
+                "items": [
+                    {"id": "api-keys", "file": "api-keys.md"},
+                    {"id": "routes", "file": "routes.md"},
+                ],
+            }
+        ],
+    }
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    guides = tmp_path / "guides"
+    guides.mkdir()
+    (guides / "api-keys.md").write_text(
+        "---\ntitle: API Keys\ndescription: Managing keys\ntags: [auth]\n---\nUse an API key to call routes.\n"
+    )
+    (guides / "routes.md").write_text(
+        "---\ntitle: Routes\ndescription: Routing requests\ntags: [http]\n---\nRoutes run nodes.\n"
+    )
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestDocumentationServiceSearch:
+
+    def test_search_ranks_title_matches_first(self, documentation_path):
+        """Test a term in a title outranks the same term in content."""
+        service = DocumentationService(str(documentation_path))
+
+        results = service.search("routes")
+
+        assert [result["id"] for result in results] == ["routes", "api-keys"]
+        assert results[0]["score"] > results[1]["score"]
+
+    def test_search_matches_inside_terms(self, documentation_path):
+        """Test a query matches as a substring of a longer word."""
+        service = DocumentationService(str(documentation_path))
+
+        results = service.search("rout")
+
+        assert {result["id"] for result in results} == {"routes", "api-keys"}
+
+    def test_search_multi_word_query(self, documentation_path):
+        """Test a query spanning several words."""
+        service = DocumentationService(str(documentation_path))
+
+        results = service.search("api key")
+
+        assert [result["id"] for result in results] == ["api-keys"]
+        assert "API key" in results[0]["snippet"]
+
+    def test_search_respects_limit_and_misses(self, documentation_path):
+        """Test the result limit and queries without matches."""
+        service = DocumentationService(str(documentation_path))
+
+        assert len(service.search("routes", limit=1)) == 1
+        assert service.search("nonexistent") == []
+
+    def test_search_index_refreshes_when_files_change(self, documentation_path):
+        """Test the cached search index is rebuilt after a document changes."""
+        service = DocumentationService(str(documentation_path))
+        service.refresh_if_changed()
+        assert service.search("schedules") == []
+
+        routes = documentation_path / "guides" / "routes.md"
+        routes.write_text(routes.read_text() + "Routes can run on schedules.\n")
+        mtime = routes.stat().st_mtime + 10
+        os.utime(routes, (mtime, mtime))
+        service.refresh_if_changed()
+
+        assert [result["id"] for result in service.search("schedules")] == ["routes"]
+
+    def test_search_index_refreshes_when_a_file_is_deleted(self, documentation_path):
+        """Test removing a document is seen even though no mtime increased."""
+        service = DocumentationService(str(documentation_path))
+        assert [result["id"] for result in service.search("api key")] == ["api-keys"]
+
+        (documentation_path / "guides" / "api-keys.md").unlink()
+        service.refresh_if_changed()
+
+        assert service.search("api key") == []
+
+    def test_refresh_checks_files_at_most_once_per_interval(self, documentation_path, monkeypatch):
+        """Test the documentation tree is only scanned once per refresh interval."""
+        now = [1000.0]
+        monkeypatch.setattr("services.documentation_service.time.monotonic", lambda: now[0])
+        service = DocumentationService(str(documentation_path), refresh_interval=5.0)
+        version = service.refresh_if_changed()
+
+        (documentation_path / "guides" / "api-keys.md").unlink()
+        now[0] += 4.0
+        assert service.refresh_if_changed() == version
+
+        now[0] += 1.0
+        assert service.refresh_if_changed() != version
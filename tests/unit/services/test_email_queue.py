@@ -0,0 +1,32 @@
+import threading
+import time
+
+import pytest
+
+from services.email import email_queue
+
+
+@pytest.mark.unit
+class TestEmailQueueDrain:
+
+    def test_drain_waits_for_queued_emails(self):
+        """Test draining returns once every queued email has been sent."""
+        sent = []
+        email_queue.enqueue_email(lambda to: (time.sleep(0.05), sent.append(to)), "a@example.com")
+
+        email_queue.drain_email_queue(timeout=5)
+
+        assert sent == ["a@example.com"]
+
+    def test_drain_gives_up_after_timeout(self):
+        """Test draining stops waiting when an email does not finish in time."""
+        release = threading.Event()
+        email_queue.enqueue_email(lambda to: release.wait(5), "b@example.com")
+
+        started = time.monotonic()
+        email_queue.drain_email_queue(timeout=0.1)
+        elapsed = time.monotonic() - started
+        release.set()
+        email_queue.drain_email_queue(timeout=5)
+
+        assert elapsed < 1
@@ -692,6 +692,56 @@ class TestLambdaService:
         with pytest.raises(ClientError):
             service.invoke_lambda(self.function_name, payload)
 
+    @patch('services.lambda_service.boto3.client')
+    @patch('services.lambda_service.settings')
+    def test_invoke_lambda_event_success(self, mock_settings, mock_boto_client):
+        """Test queueing an asynchronous lambda invocation."""
+        mock_settings.AWS_ACCESS_KEY_ID = self.mock_settings.AWS_ACCESS_KEY_ID
+        mock_settings.AWS_SECRET_ACCESS_KEY = self.mock_settings.AWS_SECRET_ACCESS_KEY
+        mock_settings.AWS_REGION = self.mock_settings.AWS_REGION
+
+        mock_lambda_client = Mock()
+        mock_boto_client.return_value = mock_lambda_client
+        mock_lambda_client.invoke.return_value = {'StatusCode': 202}
+
+        payload = {'input': 'test input'}
+
+        service = LambdaService()
+        result = service.invoke_lambda_event(self.function_name, payload)
+
+        mock_lambda_client.invoke.assert_called_once_with(
+            FunctionName=self.function_name,
+            InvocationType='Event',
+            Payload=json.dumps(payload).encode()
+        )
+        mock_lambda_client.get_waiter.assert_not_called()
+        assert result == 202
+
+    @patch('services.lambda_service.boto3.client')
+    @patch('services.lambda_service.settings')
+    def test_invoke_lambda_event_waits_for_pending_function(self, mock_settings, mock_boto_client):
+        """Test an event rejected while the function is pending is retried once it is ready."""
+        mock_settings.AWS_ACCESS_KEY_ID = self.mock_settings.AWS_ACCESS_KEY_ID
+        mock_settings.AWS_SECRET_ACCESS_KEY = self.mock_settings.AWS_SECRET_ACCESS_KEY
+        mock_settings.AWS_REGION = self.mock_settings.AWS_REGION
+
+        mock_lambda_client = Mock()
+        mock_boto_client.return_value = mock_lambda_client
+        mock_lambda_client.invoke.side_effect = [
+            ClientError(
+                error_response={'Error': {'Code': 'ResourceConflictException', 'Message': 'State: Pending'}},
+                operation_name='Invoke'
+            ),
+            {'StatusCode': 202},
+        ]
+
+        service = LambdaService()
+        result = service.invoke_lambda_event(self.function_name, {'input': 'test input'})
+
+        assert mock_lambda_client.invoke.call_count == 2
+        assert mock_lambda_client.get_waiter.return_value.wait.call_count == 2
+        assert result == 202
+
     @patch('services.lambda_service.boto3.client')
     @patch('services.lambda_service.settings')
     def test_delete_lambda_success(self, mock_settings, mock_boto_client):
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from services.local_log_service import LocalLogService, LogCapture
+
+
+@pytest.mark.unit
+class TestLogCapture:
+
+    def test_captures_output_from_worker_thread(self):
+        """Test output printed through asyncio.to_thread lands in the active capture."""
+        async def run():
+            with LogCapture("capture-thread", "mock"):
+                await asyncio.to_thread(print, "hello from thread")
+
+        asyncio.run(run())
+
+        messages = [log["message"] for log in LocalLogService.get_logs("capture-thread")]
+        assert messages == ["hello from thread"]
+        LocalLogService.clear_logs("capture-thread")
+
+    def test_overlapping_captures_keep_their_own_output(self):
+        """Test two interleaved runs each capture only their own output."""
+        async def run(version_id, first, second):
+            with LogCapture(version_id, "mock"):
+                print(first)
+                await asyncio.sleep(0.01)
+                await asyncio.to_thread(print, second)
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(
+                run("capture-a", "a1", "a2"),
+                run("capture-b", "b1", "b2"),
+            )
+
+        asyncio.run(main())
+
+        for version_id, expected in (("capture-a", ["a1", "a2"]), ("capture-b", ["b1", "b2"])):
+            messages = [log["message"] for log in LocalLogService.get_logs(version_id)]
+            assert messages == expected
+            LocalLogService.clear_logs(version_id)
+
+    def test_output_outside_capture_is_not_stored(self, capsys):
+        """Test printing after a capture ends goes to the real stdout again."""
+        with LogCapture("capture-after", "mock"):
+            pass
+        print("not captured")
+
+        assert capsys.readouterr().out == "not captured\n"
+        assert LocalLogService.get_logs("capture-after") == []
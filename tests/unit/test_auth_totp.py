@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+import pyotp
+import pytest
+
+from api.v1.auth.router import _forget_totp_secret, _totp_hmac, _totp_hmacs, verify_totp
+
+NOW = 1_700_000_015
+
+
+@pytest.fixture
+def secret():
+    return pyotp.random_base32()
+
+
+@pytest.mark.unit
+class TestVerifyTotp:
+
+    @pytest.mark.parametrize("offset", [-1, 0, 1])
+    def test_accepts_adjacent_steps(self, secret, offset):
+        """Test codes of the previous, current and next step match pyotp."""
+        code = pyotp.TOTP(secret).at(NOW + offset * 30)
+
+        with patch("api.v1.auth.router.time.time", return_value=NOW):
+            assert verify_totp(secret, code) is True
+
+    @pytest.mark.parametrize("offset", [-2, 2])
+    def test_rejects_steps_outside_window(self, secret, offset):
+        """Test codes two steps away are rejected."""
+        code = pyotp.TOTP(secret).at(NOW + offset * 30)
+
+        with patch("api.v1.auth.router.time.time", return_value=NOW):
+            assert verify_totp(secret, code) is False
+
+    def test_rejects_wrong_codes(self, secret):
+        """Test wrong, malformed and empty codes are rejected."""
+        code = pyotp.TOTP(secret).at(NOW)
+        wrong = f"{(int(code) + 1) % 1_000_000:06d}"
+
+        with patch("api.v1.auth.router.time.time", return_value=NOW):
+            assert verify_totp(secret, wrong) is False
+            assert verify_totp(secret, code[:5]) is False
+            assert verify_totp(secret, "") is False
+
+    def test_accepts_lowercase_unpadded_secret(self):
+        """Test secrets are decoded case-insensitively and without padding."""
+        secret = "JBSWY3DPEHPK3PXPJB"  # 18 characters, needs padding
+        code = pyotp.TOTP(secret).at(NOW)
+
+        with patch("api.v1.auth.router.time.time", return_value=NOW):
+            assert verify_totp(secret.lower(), code) is True
+
+
+@pytest.mark.unit
+class TestTotpHmacCache:
+
+    def test_cache_is_keyed_by_secret_hash(self, secret):
+        """Test the cached HMAC context is reused and the raw secret is not a key."""
+        assert _totp_hmac(secret) is _totp_hmac(secret)
+        assert secret not in _totp_hmacs
+
+    def test_forget_drops_only_that_secret(self, secret):
+        """Test forgetting one secret keeps other users' cached contexts."""
+        other = pyotp.random_base32()
+        other_mac = _totp_hmac(other)
+        mac = _totp_hmac(secret)
+
+        _forget_totp_secret(secret)
+
+        assert _totp_hmac(secret) is not mac
+        assert _totp_hmac(other) is other_mac
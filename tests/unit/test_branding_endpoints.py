@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from api.v1.settings import branding
+
+
+@pytest.fixture(autouse=True)
+def reset_branding_cache():
+    branding._branding_cache = None
+    yield
+    branding._branding_cache = None
+
+
+def _settings(accent_color):
+    return SimpleNamespace(logo_url="http://minio:9000/logo.png", accent_color=accent_color)
+
+
+@pytest.mark.unit
+class TestBrandingCache:
+
+    def test_get_caches_loaded_settings(self):
+        """Test the first GET loads the settings and later GETs reuse them."""
+        load_branding = Mock(return_value=branding._branding_response(_settings("#111111")))
+
+        first = asyncio.run(branding.get_branding_settings(load_branding=load_branding))
+        second = asyncio.run(branding.get_branding_settings(load_branding=load_branding))
+
+        assert first == second == {"logo_url": "http://localhost:9000/logo.png", "accent_color": "#111111"}
+        load_branding.assert_called_once()
+
+    def test_load_opens_a_session(self):
+        """Test the default loader reads the settings through its own session."""
+        with patch.object(branding, "db_context") as db_context, \
+                patch.object(branding, "GlobalSettingsRepository") as repository:
+            repository.return_value.get.return_value = _settings("#111111")
+
+            result = branding._load_branding()
+
+        db_context.assert_called_once()
+        repository.assert_called_once_with(db_context.return_value.__enter__.return_value)
+        assert result["accent_color"] == "#111111"
+
+    def test_get_does_not_overwrite_a_concurrent_update(self):
+        """Test a GET that loaded the row before an admin update keeps the update cached."""
+        def load_then_update():
+            # An admin update commits while this GET is still loading
+            branding._store_branding(_settings("#222222"))
+            return branding._branding_response(_settings("#111111"))
+
+        asyncio.run(branding.get_branding_settings(load_branding=load_then_update))
+
+        assert branding._branding_cache["accent_color"] == "#222222"
@@ -0,0 +1,34 @@
+import pytest
+
+from api.v1.documentation.documentation import _accepts_gzip
+
+
+@pytest.mark.unit
+class TestAcceptsGzip:
+
+    @pytest.mark.parametrize("header", [
+        "gzip",
+        "gzip, deflate, br",
+        "br;q=1.0, gzip;q=0.8",
+        "GZIP",
+        "x-gzip",
+        "*",
+        "identity, *;q=0.5",
+    ])
+    def test_gzip_accepted(self, header):
+        """Test headers that allow gzip get the compressed body."""
+        assert _accepts_gzip(header)
+
+    @pytest.mark.parametrize("header", [
+        "",
+        "identity",
+        "br, deflate",
+        "gzip;q=0",
+        "gzip; q=0.000",
+        "*;q=0",
+        "gzip;q=0, *",
+        "gzip;q=abc",
+    ])
+    def test_gzip_refused(self, header):
+        """Test headers that do not allow gzip get the plain body."""
+        assert not _accepts_gzip(header)
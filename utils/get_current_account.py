@@ -9,23 +9,17 @@ from db.session import get_db
 from models import Account, Membership, Project
 
 
-def get_current_account(
-    request: Request,
-    db: Session = Depends(get_db)
-) -> Account:
-    """Get the currently authenticated account.
-
-    Works with both SAAS (Cognito) and Standalone (local) auth modes.
+def get_current_token_payload(request: Request) -> dict:
+    """Validate the bearer token and return its claims, without a DB lookup.
 
     Args:
         request: FastAPI request object
-        db: Database session
 
     Returns:
-        Account object for the authenticated user
+        Token claims, guaranteed to contain 'sub'
 
     Raises:
-        HTTPException: If authentication fails or account not found
+        HTTPException: If the header is missing or the token is invalid
     """
     auth_header = request.headers.get("Authorization")
 
@@ -42,10 +36,32 @@ def get_current_account(
     decoded = provider.validate_token(token)
 
     # Get user ID from token (standard 'sub' claim)
-    sub = decoded.get("sub")
-    if not sub:
+    if not decoded.get("sub"):
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
+    return decoded
+
+
+def get_current_account(
+    request: Request,
+    db: Session = Depends(get_db)
+) -> Account:
+    """Get the currently authenticated account.
+
+    Works with both SAAS (Cognito) and Standalone (local) auth modes.
+
+    Args:
+        request: FastAPI request object
+        db: Database session
+
+    Returns:
+        Account object for the authenticated user
+
+    Raises:
+        HTTPException: If authentication fails or account not found
+    """
+    sub = get_current_token_payload(request)["sub"]
+
     # Look up account by external_user_id (was cognito_id)
     account = db.query(Account).filter(Account.external_user_id == sub).first()
     if not account:
@@ -95,4 +111,4 @@ def get_project_or_403(
     project = db.scalar(stmt)
     if not project:
         raise HTTPException(status_code=403, detail="Access denied")
-    return project
\ No newline at end of file
+    return project
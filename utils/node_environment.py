@@ -0,0 +1,39 @@
+import os
+from functools import lru_cache
+
+from core.settings import settings
+
+
+@lru_cache(maxsize=1)
+def set_node_environment_defaults() -> None:
+    """Export the settings that locally executed node code reads from the environment.
+
+    They are fixed for the lifetime of the process, so the environment is only
+    written the first time a local execution asks for them.
+    """
+    os.environ.setdefault("AWS_REGION", settings.AWS_REGION)
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", settings.AWS_ACCESS_KEY_ID)
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", settings.AWS_SECRET_ACCESS_KEY)
+
+    # Set database URLs for section nodes
+    # Strip psycopg2 dialect for nodes (they use sqlalchemy with psycopg2-binary)
+    database_url = settings.DATABASE_URL.replace("postgresql+psycopg2://", "postgresql://")
+    os.environ.setdefault("DATABASE_URL", database_url)
+    os.environ.setdefault("SECTIONS_DATABASE_URL", settings.SECTIONS_DATABASE_URL)
+
+
+def set_node_project(project_id, tenant_id=None) -> None:
+    """Point PROJECT_ID/TENANT_ID at the project a local execution runs for.
+
+    Node packages read these from the environment, so they have to stay there;
+    consecutive runs are usually for the same project, in which case the
+    environment (and its putenv call) is left alone.
+    """
+    _set_env("PROJECT_ID", str(project_id))
+    if tenant_id:
+        _set_env("TENANT_ID", str(tenant_id))
+
+
+def _set_env(key: str, value: str) -> None:
+    if os.environ.get(key) != value:
+        os.environ[key] = value
@@ -0,0 +1,23 @@
+from functools import lru_cache
+from types import CodeType
+
+
+@lru_cache(maxsize=64)
+def compile_node_setup(code: str) -> CodeType:
+    """Compile generated node setup source once per distinct source text.
+
+    A version's executable only changes when it is regenerated, and then the
+    new source gets its own cache entry, so nothing needs invalidating.
+    """
+    return compile(code, "<node_setup>", "exec")
+
+
+def load_node_setup_namespace(code: str, namespace: dict) -> dict:
+    """Execute node setup source into namespace and return it.
+
+    Meant to be called through asyncio.to_thread, so module-level work in the
+    generated code does not block the event loop. to_thread copies the
+    caller's context, so LogCapture still sees output from the worker thread.
+    """
+    exec(compile_node_setup(code), namespace)
+    return namespace